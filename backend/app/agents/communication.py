@@ -7,6 +7,7 @@ import logging
 from app import database as db
 from app.config import Config
 from app.llm import chat_json
+from app.models import EmailDraft
 from app.prompts import DRAFT_EMAIL_ENHANCED
 
 log = logging.getLogger(__name__)
@@ -88,6 +89,7 @@ def draft_email(
             cfg,
             system=DRAFT_EMAIL_ENHANCED,
             messages=[{"role": "user", "content": user_msg}],
+            schema=EmailDraft,
         )
     except Exception as e:
         log.error("Communication agent LLM call failed: %s", e)
@@ -6,6 +6,9 @@ Pipeline position:
 
 from __future__ import annotations
 
+import hashlib
+
+from app import database as db
 from app.config import Config
 from app.llm import chat_json
 from app.prompts import PARSE_JD
@@ -17,7 +20,24 @@ def parse_jd_text(cfg: Config, raw_text: str) -> dict:
     Returns a dict with keys matching the Job model:
       title, company, required_skills, preferred_skills,
       experience_years, location, remote, salary_range, summary
+
+    Results are cached by a hash of the provider / model, prompt and text,
+    so re-submitting the same JD to the same model skips the LLM call.
     """
+    key = hashlib.blake2b(
+        f"{cfg.llm_provider}\0{cfg.llm_model}\0{PARSE_JD}\0{raw_text}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    cached = db.get_jd_parse(key)
+    if cached is not None:
+        return cached
+
+    parsed = _parse_with_llm(cfg, raw_text)
+    db.put_jd_parse(key, parsed)
+    return parsed
+
+
+def _parse_with_llm(cfg: Config, raw_text: str) -> dict:
     data = chat_json(
         cfg,
         system=PARSE_JD,
@@ -33,7 +53,7 @@ def parse_jd_text(cfg: Config, raw_text: str) -> dict:
         "company": data.get("company", ""),
         "required_skills": data.get("required_skills", []),
         "preferred_skills": data.get("preferred_skills", []),
-        "experience_years": _safe_int(data.get("experience_years")),&&，&，里面                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
+        "experience_years": _safe_int(data.get("experience_years")),
         "location": data.get("location", ""),
         "remote": bool(data.get("remote", False)),
         "salary_range": data.get("salary_range", ""),
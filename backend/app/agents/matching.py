@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from app import database as db
 from app import vectorstore
 from app.config import Config
 from app.llm import chat_json
-from app.prompts import MATCHING
+from app.models import BatchMatchResult, MatchResult
+from app.prompts import MATCHING, MATCHING_BATCH
 
 log = logging.getLogger(__name__)
 
+# Candidates scored per batched LLM call — keeps the JSON reply well inside max_tokens.
+_BATCH_SIZE = 10
+# Concurrent LLM calls per matching run — overlaps network latency without
+# tripping provider rate limits.
+_MAX_WORKERS = 4
+
 
 def rank_candidates_for_job(
     job_id: str,
@@ -34,34 +44,71 @@ def rank_candidates_for_job(
     return results
 
 
+def _candidate_profile(candidate: dict) -> str:
+    skills = candidate.get("skills", [])
+    if isinstance(skills, list):
+        skills_str = ", ".join(skills)
+    else:
+        skills_str = str(skills)
+
+    return (
+        f"Name: {candidate['name']}\n"
+        f"Title: {candidate.get('current_title', '')}\n"
+        f"Skills: {skills_str}\n"
+        f"Experience: {candidate.get('experience_years', 'N/A')} years\n"
+        f"Summary: {candidate.get('resume_summary', '')}\n"
+    )
+
+
+def _match_key(cfg: Config, job: dict, candidate: dict) -> str:
+    """Cache key for a (job, candidate) score: hash of the model, prompts and both inputs.
+
+    Switching provider / model, or any edit to the JD text, the candidate
+    profile fields or the prompts, yields a new key, so a cached score is
+    only reused for identical input. Entries expire via ``db.maintain_db()``.
+    """
+    text = (
+        f"{cfg.llm_provider}\0{cfg.llm_model}\0{MATCHING}\0{MATCHING_BATCH}\0"
+        f"{job['raw_text']}\0{_candidate_profile(candidate)}"
+    )
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _match_result(data: dict) -> dict:
+    return {
+        "score": float(data.get("score", 0.0)),
+        "strengths": data.get("strengths", []),
+        "gaps": data.get("gaps", []),
+        "reasoning": data.get("reasoning", ""),
+    }
+
+
 def match_candidate_to_job(cfg: Config, job_id: str, candidate_id: str) -> dict:
     """Detailed LLM-based matching of one candidate against one job.
 
     Returns ``{"score": float, "strengths": list, "gaps": list, "reasoning": str}``.
+    Scores are cached per :func:`_match_key`; errors are not cached.
     """
     job = db.get_job(job_id)
     candidate = db.get_candidate(candidate_id)
     if not job or not candidate:
         return {"score": 0.0, "strengths": [], "gaps": [], "reasoning": "Record not found"}
 
-    skills = candidate.get("skills", [])
-    if isinstance(skills, list):
-        skills_str = ", ".join(skills)
-    else:
-        skills_str = str(skills)
+    key = _match_key(cfg, job, candidate)
+    cached = db.get_match_results([key])
+    if key in cached:
+        return cached[key]
 
     user_msg = (
         f"## Job Description\n{job['raw_text']}\n\n"
         f"## Candidate Profile\n"
-        f"Name: {candidate['name']}\n"
-        f"Title: {candidate.get('current_title', '')}\n"
-        f"Skills: {skills_str}\n"
-        f"Experience: {candidate.get('experience_years', 'N/A')} years\n"
-        f"Summary: {candidate.get('resume_summary', '')}\n"
+        f"{_candidate_profile(candidate)}"
     )
 
     try:
-        data = chat_json(cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}])
+        data = chat_json(
+            cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}], schema=MatchResult,
+        )
     except Exception as e:
         log.error("LLM matching call failed: %s", e)
         return {"score": 0.0, "strengths": [], "gaps": [], "reasoning": f"LLM error: {e}"}
@@ -69,9 +116,88 @@ def match_candidate_to_job(cfg: Config, job_id: str, candidate_id: str) -> dict:
     if isinstance(data, list):
         data = data[0] if data else {}
 
-    return {
-        "score": float(data.get("score", 0.0)),
-        "strengths": data.get("strengths", []),
-        "gaps": data.get("gaps", []),
-        "reasoning": data.get("reasoning", ""),
-    }
+    result = _match_result(data)
+    db.put_match_results({key: result})
+    return result
+
+
+def match_candidates_to_job(cfg: Config, job_id: str, candidate_ids: list[str]) -> dict[str, dict]:
+    """Detailed LLM-based matching of several candidates against one job.
+
+    Candidates with a cached score for this exact JD and profile are not
+    sent to the LLM again. The rest are scored ``_BATCH_SIZE`` at a time in
+    a single LLM call instead of one call each.  If a batched reply fails to parse, or omits a
+    candidate, those candidates fall back to :func:`match_candidate_to_job`.
+    Batches and fallbacks each run concurrently on up to ``_MAX_WORKERS``
+    threads.
+
+    Returns ``{candidate_id: match_result}`` in *candidate_ids* order, where
+    each result has the same shape as :func:`match_candidate_to_job`.
+    Unknown candidate IDs are skipped.
+    """
+    job = db.get_job(job_id)
+    if not job:
+        return {}
+    candidates = [c for c in (db.get_candidate(cid) for cid in candidate_ids) if c]
+
+    keys = {c["id"]: _match_key(cfg, job, c) for c in candidates}
+    cached = db.get_match_results(list(keys.values()))
+    scored: dict[str, dict] = {cid: cached[key] for cid, key in keys.items() if key in cached}
+
+    pending = [c for c in candidates if c["id"] not in scored]
+    batches = [pending[i:i + _BATCH_SIZE] for i in range(0, len(pending), _BATCH_SIZE)]
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        for batch_scores in executor.map(
+            lambda batch: _score_batch(cfg, job, batch) if len(batch) > 1 else {}, batches,
+        ):
+            scored.update(batch_scores)
+
+        missing = [c["id"] for c in pending if c["id"] not in scored]
+        for cid, result in zip(missing, executor.map(
+            lambda cid: match_candidate_to_job(cfg, job_id, cid), missing,
+        )):
+            scored[cid] = result
+
+    return {c["id"]: scored[c["id"]] for c in candidates}
+
+
+def _score_batch(cfg: Config, job: dict, batch: list[dict]) -> dict[str, dict]:
+    """Score *batch* with one MATCHING_BATCH call. Returns ``{}`` on an unparseable reply."""
+    profiles = "\n".join(
+        f"### Candidate ID: {c['id']}\n{_candidate_profile(c)}" for c in batch
+    )
+    user_msg = (
+        f"## Job Description\n{job['raw_text']}\n\n"
+        f"## Candidates ({len(batch)})\n\n"
+        f"{profiles}"
+    )
+
+    try:
+        data = chat_json(
+            cfg, system=MATCHING_BATCH, messages=[{"role": "user", "content": user_msg}],
+            schema=BatchMatchResult,
+        )
+    except json.JSONDecodeError as e:
+        log.warning("Batched matching reply was not valid JSON, scoring individually: %s", e)
+        return {}
+    except Exception as e:
+        log.error("LLM batch matching call failed: %s", e)
+        error = {"score": 0.0, "strengths": [], "gaps": [], "reasoning": f"LLM error: {e}"}
+        return {c["id"]: dict(error) for c in batch}
+
+    entries = data.get("matches", []) if isinstance(data, dict) else data
+    batch_ids = {c["id"] for c in batch}
+    scored: dict[str, dict] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        cid = str(entry.get("candidate_id", ""))
+        if cid not in batch_ids:
+            continue
+        try:
+            scored[cid] = _match_result(entry)
+        except (TypeError, ValueError):
+            continue
+    db.put_match_results({_match_key(cfg, job, c): scored[c["id"]] for c in batch if c["id"] in scored})
+    return scored
@@ -6,10 +6,29 @@ Pipeline position:
 
 from __future__ import annotations
 
+import re
+
 from app.config import Config
 from app.llm import chat_json
+from app.models import ParsedResume
 from app.prompts import PARSE_RESUME
 
+# Contact details are pulled straight from the text — exact, and a fallback
+# when the LLM leaves them out or mangles them.
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Phone: optional "phone/tel/mobile" label, then digits separated by spaces,
+# dashes or parentheses only — "." would let in GPAs and version numbers.
+_PHONE_RE = re.compile(
+    r"(?:(?<![a-z])(?P<label>phone|tel|mobile|cell|电话|手机)\W{0,3})?"
+    r"(?<![\w.+])(?P<number>\+?\(?\d[\d ()-]{7,}\d)(?![\w.])",
+    re.IGNORECASE,
+)
+_YEAR_RE = re.compile(r"(?<!\d)(?:19|20)\d\d(?!\d)")
+
+# PDF/DOCX extraction leaves runs of spaces and blank lines that cost tokens
+_SPACES_RE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
 
 def parse_resume_text(cfg: Config, raw_text: str) -> dict:
     """Parse raw resume text into structured candidate fields via LLM.
@@ -18,10 +37,12 @@ def parse_resume_text(cfg: Config, raw_text: str) -> dict:
       name, email, phone, current_title, current_company,
       skills, experience_years, location, resume_summary
     """
+    text = _BLANK_LINES_RE.sub("\n\n", _SPACES_RE.sub(" ", raw_text)).strip()
     data = chat_json(
         cfg,
         system=PARSE_RESUME,
-        messages=[{"role": "user", "content": raw_text}],
+        messages=[{"role": "user", "content": text}],
+        schema=ParsedResume,
     )
 
     # Normalise — the LLM may return slightly different shapes
@@ -30,8 +51,8 @@ def parse_resume_text(cfg: Config, raw_text: str) -> dict:
 
     return {
         "name": data.get("name", ""),
-        "email": data.get("email", ""),
-        "phone": data.get("phone", ""),
+        "email": data.get("email") or _find_email(text),
+        "phone": data.get("phone") or _find_phone(text),
         "current_title": data.get("current_title", ""),
         "current_company": data.get("current_company", ""),
         "skills": data.get("skills", []),
@@ -42,6 +63,23 @@ def parse_resume_text(cfg: Config, raw_text: str) -> dict:
     }
 
 
+def _find_email(text: str) -> str:
+    m = _EMAIL_RE.search(text)
+    return m.group(0) if m else ""
+
+
+def _find_phone(text: str) -> str:
+    # 9-15 digits (E.164 max). Unlabelled numbers without a leading "+" must
+    # not contain a year-like group, so date ranges and "Zip 94105 2019" don't count.
+    for m in _PHONE_RE.finditer(text):
+        number = m.group("number").strip()
+        if not 9 <= sum(ch.isdigit() for ch in number) <= 15:
+            continue
+        if m.group("label") or number.startswith("+") or not _YEAR_RE.search(number):
+            return number
+    return ""
+
+
 def _safe_int(val) -> int | None:
     if val is None:
         return None
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from app import database as db
+from app import vectorstore
 
 log = logging.getLogger(__name__)
 
+# Concurrent LLM calls when drafting follow-ups — same limit as the matcher.
+_MAX_WORKERS = 4
+
 
 def run_auto_match(conditions: dict, actions: dict) -> dict:
     """Match unmatched candidates against open jobs.
@@ -16,15 +21,18 @@ def run_auto_match(conditions: dict, actions: dict) -> dict:
     Conditions:
         job_id: specific job to match against (empty = all jobs)
         min_score_threshold: minimum score to save (default 0.3)
+        top_k: candidates per job sent to the LLM, picked by embedding
+            similarity (default 20)
     Actions:
         update_status: auto-move to screening if score >= 0.7
     """
-    from app.agents.matching import match_candidate_to_job
+    from app.agents.matching import match_candidates_to_job
     from app.routes.settings import get_config
 
     cfg = get_config()
     job_id = conditions.get("job_id", "")
     threshold = float(conditions.get("min_score_threshold", 0.3))
+    top_k = int(conditions.get("top_k", 20))
     update_status = actions.get("update_status", False)
 
     # Find candidates with status=new and no match score
@@ -57,26 +65,37 @@ def run_auto_match(conditions: dict, actions: dict) -> dict:
     affected = 0
     match_details = []
 
+    # Shortlist each job's closest candidates by embedding similarity, then
+    # score only those pairs in batched, concurrent LLM calls
+    unmatched_ids = [c["id"] for c in unmatched]
+    job_ids = [j["id"] for j in jobs]
+    try:
+        shortlists = vectorstore.shortlist_candidates_for_jobs(job_ids, unmatched_ids, k=top_k)
+    except Exception as e:
+        log.warning("Vector shortlist failed, scoring all candidates: %s", e)
+        shortlists = {jid: unmatched_ids for jid in job_ids}
+
+    results_by_job: dict[str, dict[str, dict]] = {}
+    for job in jobs:
+        try:
+            results_by_job[job["id"]] = match_candidates_to_job(cfg, job["id"], shortlists[job["id"]])
+        except Exception as e:
+            log.warning("Match failed for job %s: %s", job["id"], e)
+
     for candidate in unmatched:
         best_score = 0.0
         best_job = None
         best_result = None
 
         for job in jobs:
-            try:
-                result = match_candidate_to_job(cfg, job["id"], candidate["id"])
-                score = result.get("score", 0.0)
-                if score > best_score:
-                    best_score = score
-                    best_job = job
-                    best_result = result
-            except Exception as e:
-                log.warning(
-                    "Match failed for candidate %s / job %s: %s",
-                    candidate["id"],
-                    job["id"],
-                    e,
-                )
+            result = results_by_job.get(job["id"], {}).get(candidate["id"])
+            if not result:
+                continue
+            score = result.get("score", 0.0)
+            if score > best_score:
+                best_score = score
+                best_job = job
+                best_result = result
 
         if best_result and best_score >= threshold and best_job:
             updates: dict = {
@@ -229,7 +248,7 @@ def run_auto_followup(conditions: dict, actions: dict) -> dict:
         job_id: filter to specific job's candidates
     """
     from app.agents.communication import draft_email
-    from app.models import Email
+    from app.models import Email, batch_now
     from app.routes.settings import get_config
 
     cfg = get_config()
@@ -249,6 +268,8 @@ def run_auto_followup(conditions: dict, actions: dict) -> dict:
     sent = 0
     followup_details = []
 
+    # Pass 1: pick candidates that are due a follow-up (DB only)
+    due: list[tuple[dict, dict, int]] = []
     for candidate in candidates:
         emails = db.list_emails(candidate_id=candidate["id"])
         sent_emails = [e for e in emails if e["sent"] and not e["reply_received"]]
@@ -264,32 +285,46 @@ def run_auto_followup(conditions: dict, actions: dict) -> dict:
         last_sent_at = last_sent.get("sent_at", "")
         if not last_sent_at or last_sent_at > cutoff:
             continue
+        due.append((candidate, last_sent, len(followup_emails)))
 
-        # Draft follow-up
+    # Pass 2: draft all follow-ups concurrently — each is an independent LLM call
+    def _draft(item: tuple[dict, dict, int]) -> dict | None:
+        candidate, last_sent, n_followups = item
         try:
-            draft = draft_email(
+            return draft_email(
                 cfg,
                 candidate["id"],
                 candidate.get("job_id", ""),
                 "followup",
-                f"This is follow-up #{len(followup_emails) + 1}. "
+                f"This is follow-up #{n_followups + 1}. "
                 f"Previous email subject: {last_sent.get('subject', '')}",
             )
         except Exception as e:
             log.warning("Failed to draft followup for %s: %s", candidate["name"], e)
-            continue
-
-        new_email = Email(
-            candidate_id=candidate["id"],
-            candidate_name=candidate["name"],
-            to_email=candidate.get("email", ""),
-            subject=draft.get("subject", f"Following up — {last_sent.get('subject', '')}"),
-            body=draft.get("body", ""),
-            email_type="followup",
-        )
-        db.insert_email(new_email.model_dump())
-        drafted += 1
-
+            return None
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        drafts = list(executor.map(_draft, due))
+
+    # Pass 3: save all drafts in one transaction, then (optionally) send
+    # in candidate order
+    with batch_now():
+        new_emails = [
+            (candidate, Email(
+                candidate_id=candidate["id"],
+                candidate_name=candidate["name"],
+                to_email=candidate.get("email", ""),
+                subject=draft.get("subject", f"Following up — {last_sent.get('subject', '')}"),
+                body=draft.get("body", ""),
+                email_type="followup",
+            ))
+            for (candidate, last_sent, _), draft in zip(due, drafts)
+            if draft is not None
+        ]
+    db.insert_emails([e.model_dump() for _, e in new_emails])
+    drafted = len(new_emails)
+
+    for candidate, new_email in new_emails:
         if auto_send and candidate.get("email"):
             from app.tools.email_sender import send_email as do_send
 
@@ -303,6 +338,7 @@ def run_auto_followup(conditions: dict, actions: dict) -> dict:
                 smtp_port=cfg.smtp_port,
                 smtp_username=cfg.smtp_username,
                 smtp_password=cfg.smtp_password,
+                sendgrid_api_key=cfg.sendgrid_api_key,
             )
             if result.get("status") == "ok":
                 db.update_email(new_email.id, {
@@ -349,8 +385,7 @@ def run_pipeline_cleanup(conditions: dict, actions: dict) -> dict:
     now = datetime.now().isoformat()
 
     stale = []
-    all_candidates = db.list_candidates()
-    for c in all_candidates:
+    for c in db.iter_candidate_rows():
         if c.get("status") not in target_statuses:
             continue
         updated = c.get("updated_at") or c.get("created_at", "")
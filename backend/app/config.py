@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass, field
 
@@ -68,8 +69,13 @@ class Config:
             }.get(self.llm_provider, "claude-sonnet-4-20250514")
 
 
+@functools.cache
 def load_config_from_env() -> Config:
-    """Bootstrap config from environment variables (used on first run)."""
+    """Bootstrap config from environment variables (used on first run).
+
+    Cached: .env is loaded once at import and the environment doesn't change
+    at runtime. Treat the returned Config as read-only.
+    """
     return Config(
         llm_provider=os.getenv("LLM_PROVIDER", "anthropic"),
         llm_model=os.getenv("LLM_MODEL", ""),
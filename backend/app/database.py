@@ -6,9 +6,23 @@ import json
 import os
 import sqlite3
 import uuid
-from datetime import datetime
+import zlib
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    # C-accelerated codec for the JSON list/dict columns; installed with
+    # chromadb, so the stdlib fallback is only for stripped-down envs.
+    import orjson
+    from orjson import loads as _json_loads
+
+    def _json_dumps(value) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 _data_dir = os.environ.get("OPEN_RECRUITER_DATA_DIR")
 if _data_dir:
     _base = Path(_data_dir)
@@ -18,13 +32,92 @@ else:
     DB_PATH = Path(__file__).resolve().parent.parent / "open_recruiter.db"
 
 
+# Full JD text (jobs / seeker_jobs ``raw_text``) is stored zlib-compressed
+# once it reaches this size. SQLite keeps it as a BLOB in the TEXT column, so
+# the storage class tells compressed and plain (older / short) rows apart.
+_COMPRESS_MIN_CHARS = 1024
+
+
+def _pack_text(text: str | None) -> str | bytes | None:
+    if text and len(text) >= _COMPRESS_MIN_CHARS:
+        return zlib.compress(text.encode("utf-8"))
+    return text
+
+
+def _unpack_text(value: str | bytes | None) -> str | None:
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(str(DB_PATH))
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL only needs an fsync at checkpoint time, so NORMAL is still
+    # crash-safe.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
+# VACUUM once free pages make up this share of the file, i.e. the file has
+# grown to ~2x the data it actually holds.
+_VACUUM_FREE_RATIO = 0.5
+# LLM result caches (JD parses, match scores) are re-computed after this long
+_CACHE_MAX_AGE = timedelta(days=30)
+_CACHE_TABLES = ("jd_parse_cache", "match_cache")
+
+
+def maintain_db() -> dict:
+    """Prune stale LLM caches, refresh planner stats, truncate the WAL file
+    and VACUUM if bloated.
+
+    Run hourly by the scheduler and once on shutdown. Returns the page
+    counts it saw so callers can log them.
+    """
+    cutoff = (datetime.now() - _CACHE_MAX_AGE).isoformat()
+    conn = get_conn()
+    try:
+        with conn:
+            pruned = sum(
+                conn.execute(f"DELETE FROM {table} WHERE created_at < ?", (cutoff,)).rowcount
+                for table in _CACHE_TABLES
+            )
+        conn.execute("PRAGMA optimize")
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        vacuumed = bool(page_count) and freelist / page_count >= _VACUUM_FREE_RATIO
+        if vacuumed:
+            conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return {
+        "page_count": page_count, "freelist_count": freelist,
+        "vacuumed": vacuumed, "cache_rows_pruned": pruned,
+    }
+
+
+def _iter_dicts(conn: sqlite3.Connection, query: str, params=()) -> Iterator[dict]:
+    """Run a bulk SELECT and yield one plain dict per row as it is stepped.
+
+    Fetches plain tuples and zips them with the column names read once from
+    the cursor, instead of building a ``sqlite3.Row`` per row and resolving
+    every column by name again in ``dict(row)``.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(query, params)
+    names = [col[0] for col in cur.description]
+    for row in cur:
+        yield dict(zip(names, row))
+
+
+def _fetch_dicts(conn: sqlite3.Connection, query: str, params=()) -> list[dict]:
+    return list(_iter_dicts(conn, query, params))
+
+
 def init_db() -> None:
     """Create tables if they don't exist."""
     conn = get_conn()
@@ -435,22 +528,20 @@ def init_db() -> None:
             "SELECT id, job_id, match_score, match_reasoning, strengths, gaps FROM candidates WHERE job_id != '' AND job_id IS NOT NULL"
         ).fetchall()
         now = datetime.now().isoformat()
-        for r in rows:
-            existing = conn.execute(
-                "SELECT id FROM candidate_jobs WHERE candidate_id = ? AND job_id = ?",
-                (r["id"], r["job_id"]),
-            ).fetchone()
-            if not existing:
-                conn.execute(
-                    """INSERT INTO candidate_jobs (id, candidate_id, job_id, match_score, match_reasoning, strengths, gaps, created_at, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        uuid.uuid4().hex[:8], r["id"], r["job_id"],
-                        r["match_score"] or 0.0, r["match_reasoning"] or "",
-                        r["strengths"] or "[]", r["gaps"] or "[]",
-                        now, now,
-                    ),
+        # UNIQUE(candidate_id, job_id) skips links that already exist
+        conn.executemany(
+            """INSERT OR IGNORE INTO candidate_jobs (id, candidate_id, job_id, match_score, match_reasoning, strengths, gaps, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    uuid.uuid4().hex[:8], r["id"], r["job_id"],
+                    r["match_score"] or 0.0, r["match_reasoning"] or "",
+                    r["strengths"] or "[]", r["gaps"] or "[]",
+                    now, now,
                 )
+                for r in rows
+            ],
+        )
         conn.commit()
     except Exception:
         pass  # Best-effort migration
@@ -493,6 +584,17 @@ def init_db() -> None:
             context TEXT DEFAULT 'recruiter',
             created_at TEXT NOT NULL
         );
+        CREATE TABLE IF NOT EXISTS jd_parse_cache (
+            hash TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS match_cache (
+            hash TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
     """)
     conn.commit()
 
@@ -508,6 +610,26 @@ def init_db() -> None:
         except sqlite3.OperationalError:
             pass
 
+    # Indexes for the hot filtered / sorted list queries (after migrations,
+    # so every indexed column exists on older databases too)
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_candidates_status_created
+            ON candidates(status, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_candidate_jobs_job_score
+            ON candidate_jobs(job_id, match_score DESC);
+        CREATE INDEX IF NOT EXISTS idx_emails_candidate_created
+            ON emails(candidate_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_emails_created ON emails(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_chat_messages_user_session_created
+            ON chat_messages(user_id, session_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_chat_messages_user_created
+            ON chat_messages(user_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_activities_user_created
+            ON activities(user_id, created_at DESC);
+    """)
+    conn.commit()
+
     conn.close()
 
 
@@ -522,10 +644,11 @@ def get_settings() -> dict[str, str]:
 
 def put_settings(data: dict[str, str]) -> None:
     conn = get_conn()
-    for k, v in data.items():
-        conn.execute(
-            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (k, v)
-        )
+    conn.executemany(
+        "INSERT INTO settings (key, value) VALUES (?, ?)"
+        " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        data.items(),
+    )
     conn.commit()
     conn.close()
 
@@ -627,12 +750,12 @@ def insert_job(job: dict) -> None:
         (
             job["id"], job["title"], job["company"],
             job.get("posted_date", ""),
-            json.dumps(job.get("required_skills", [])),
-            json.dumps(job.get("preferred_skills", [])),
+            _json_dumps(job.get("required_skills", [])),
+            _json_dumps(job.get("preferred_skills", [])),
             job.get("experience_years"),
             job.get("location", ""), int(job.get("remote", False)),
             job.get("salary_range", ""), job.get("summary", ""),
-            job.get("raw_text", ""),
+            _pack_text(job.get("raw_text", "")),
             job.get("contact_name", ""), job.get("contact_email", ""),
             job["created_at"],
         ),
@@ -643,24 +766,22 @@ def insert_job(job: dict) -> None:
 
 def list_jobs() -> list[dict]:
     conn = get_conn()
-    rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC").fetchall()
+    rows = _fetch_dicts(conn, "SELECT * FROM jobs ORDER BY created_at DESC")
+    # Candidate counts for all jobs in one grouped query
+    counts = dict(conn.execute(
+        "SELECT job_id, COUNT(*) FROM candidate_jobs GROUP BY job_id"
+    ).fetchall())
     conn.close()
     results = []
-    for r in rows:
-        d = dict(r)
-        d["required_skills"] = json.loads(d["required_skills"] or "[]")
-        d["preferred_skills"] = json.loads(d["preferred_skills"] or "[]")
+    for d in rows:
+        d["required_skills"] = _json_loads(d["required_skills"] or "[]")
+        d["preferred_skills"] = _json_loads(d["preferred_skills"] or "[]")
+        d["raw_text"] = _unpack_text(d["raw_text"])
         d["remote"] = bool(d["remote"])
         d.setdefault("posted_date", "")
         d.setdefault("contact_name", "")
         d.setdefault("contact_email", "")
-        # Count candidates via candidate_jobs
-        conn2 = get_conn()
-        cnt = conn2.execute(
-            "SELECT COUNT(*) as c FROM candidate_jobs WHERE job_id = ?", (d["id"],)
-        ).fetchone()["c"]
-        conn2.close()
-        d["candidate_count"] = cnt
+        d["candidate_count"] = counts.get(d["id"], 0)
         results.append(d)
     return results
 
@@ -672,8 +793,9 @@ def get_job(job_id: str) -> dict | None:
     if not row:
         return None
     d = dict(row)
-    d["required_skills"] = json.loads(d["required_skills"] or "[]")
-    d["preferred_skills"] = json.loads(d["preferred_skills"] or "[]")
+    d["required_skills"] = _json_loads(d["required_skills"] or "[]")
+    d["preferred_skills"] = _json_loads(d["preferred_skills"] or "[]")
+    d["raw_text"] = _unpack_text(d["raw_text"])
     d["remote"] = bool(d["remote"])
     d.setdefault("posted_date", "")
     d.setdefault("contact_name", "")
@@ -692,7 +814,9 @@ def update_job(job_id: str, updates: dict) -> bool:
     params = []
     for k, v in updates.items():
         if k in ("required_skills", "preferred_skills"):
-            v = json.dumps(v)
+            v = _json_dumps(v)
+        if k == "raw_text":
+            v = _pack_text(v)
         if isinstance(v, bool):
             v = int(v)
         sets.append(f"{k} = ?")
@@ -730,7 +854,7 @@ def insert_candidate(c: dict) -> None:
         (
             c["id"], c.get("name", ""), c.get("email", ""), c.get("phone", ""),
             c.get("current_title", ""), c.get("current_company", ""),
-            json.dumps(c.get("skills", [])), c.get("experience_years"),
+            _json_dumps(c.get("skills", [])), c.get("experience_years"),
             c.get("location", ""), c.get("date_of_birth", ""),
             c.get("resume_path", ""), c.get("resume_summary", ""),
             c.get("status", "new"), c.get("notes", ""),
@@ -758,7 +882,7 @@ def list_candidates(job_id: str | None = None, status: str | None = None) -> lis
             query += " AND c.status = ?"
             params.append(status)
         query += " ORDER BY cj.match_score DESC"
-        rows = conn.execute(query, params).fetchall()
+        rows = _fetch_dicts(conn, query, params)
         conn.close()
         results = []
         for r in rows:
@@ -766,8 +890,8 @@ def list_candidates(job_id: str | None = None, status: str | None = None) -> lis
             # Overlay match data from candidate_jobs
             d["match_score"] = r["_cj_match_score"] or 0.0
             d["match_reasoning"] = r["_cj_match_reasoning"] or ""
-            d["strengths"] = json.loads(r["_cj_strengths"] or "[]")
-            d["gaps"] = json.loads(r["_cj_gaps"] or "[]")
+            d["strengths"] = _json_loads(r["_cj_strengths"] or "[]")
+            d["gaps"] = _json_loads(r["_cj_gaps"] or "[]")
             d["job_id"] = job_id
             results.append(d)
         return results
@@ -778,13 +902,18 @@ def list_candidates(job_id: str | None = None, status: str | None = None) -> lis
             query += " AND status = ?"
             params.append(status)
         query += " ORDER BY created_at DESC"
-        rows = conn.execute(query, params).fetchall()
+        rows = _fetch_dicts(conn, query, params)
         conn.close()
+        # Fetch every candidate_jobs link once and group by candidate
+        # (already sorted by match_score DESC) instead of querying per row
+        matches_by_candidate: dict[str, list[dict]] = {}
+        for m in list_candidate_jobs():
+            matches_by_candidate.setdefault(m["candidate_id"], []).append(m)
         results = []
         for r in rows:
             d = _row_to_candidate(r)
             # Attach job_matches summary
-            d["job_matches"] = list_candidate_jobs(candidate_id=d["id"])
+            d["job_matches"] = matches_by_candidate.get(d["id"], [])
             # For backward compat: pick best match score
             if d["job_matches"]:
                 best = max(d["job_matches"], key=lambda m: m["match_score"])
@@ -801,6 +930,31 @@ def list_candidates(job_id: str | None = None, status: str | None = None) -> lis
         return results
 
 
+def iter_candidate_rows(status: str | None = None) -> Iterator[dict]:
+    """Lightweight candidate listing for status/staleness checks.
+
+    Yields only id, name, email, status, created_at and updated_at — no
+    skills/summary/notes and no per-candidate ``job_matches`` lookup, unlike
+    :func:`list_candidates`. Rows are streamed from the cursor, so single-pass
+    callers never hold the whole table in memory.
+    """
+    conn = get_conn()
+    query = "SELECT id, name, email, status, created_at, updated_at FROM candidates"
+    params: list = []
+    if status:
+        query += " WHERE status = ?"
+        params.append(status)
+    query += " ORDER BY created_at DESC"
+    try:
+        yield from _iter_dicts(conn, query, params)
+    finally:
+        conn.close()
+
+
+def list_candidate_rows(status: str | None = None) -> list[dict]:
+    return list(iter_candidate_rows(status))
+
+
 def get_candidate(cid: str) -> dict | None:
     conn = get_conn()
     row = conn.execute("SELECT * FROM candidates WHERE id = ?", (cid,)).fetchone()
@@ -831,7 +985,7 @@ def update_candidate(cid: str, updates: dict) -> bool:
     new_status = updates.get("status")
     for k, v in updates.items():
         if k in ("skills",):
-            v = json.dumps(v)
+            v = _json_dumps(v)
         # Skip match fields — they belong to candidate_jobs now
         if k in ("match_score", "match_reasoning", "strengths", "gaps", "job_id"):
             continue
@@ -875,7 +1029,7 @@ def find_candidate_by_identity(name: str, email: str, date_of_birth: str = "") -
 
 def _row_to_candidate(row) -> dict:
     d = dict(row)
-    d["skills"] = json.loads(d.get("skills") or "[]")
+    d["skills"] = _json_loads(d.get("skills") or "[]")
     d.setdefault("date_of_birth", "")
     return d
 
@@ -892,7 +1046,7 @@ def insert_candidate_job(cj: dict) -> None:
             cj.get("id", uuid.uuid4().hex[:8]),
             cj["candidate_id"], cj["job_id"],
             cj.get("match_score", 0.0), cj.get("match_reasoning", ""),
-            json.dumps(cj.get("strengths", [])), json.dumps(cj.get("gaps", [])),
+            _json_dumps(cj.get("strengths", [])), _json_dumps(cj.get("gaps", [])),
             cj.get("pipeline_status", "new"),
             cj.get("created_at", datetime.now().isoformat()),
             cj.get("updated_at", datetime.now().isoformat()),
@@ -923,7 +1077,7 @@ def list_candidate_jobs(candidate_id: str | None = None, job_id: str | None = No
         query += " AND cj.job_id = ?"
         params.append(job_id)
     query += " ORDER BY cj.match_score DESC"
-    rows = conn.execute(query, params).fetchall()
+    rows = _fetch_dicts(conn, query, params)
     conn.close()
     return [_row_to_candidate_job(r) for r in rows]
 
@@ -934,7 +1088,7 @@ def update_candidate_job(candidate_id: str, job_id: str, updates: dict) -> bool:
     params = []
     for k, v in updates.items():
         if k in ("strengths", "gaps"):
-            v = json.dumps(v)
+            v = _json_dumps(v)
         sets.append(f"{k} = ?")
         params.append(v)
     if not sets:
@@ -949,6 +1103,44 @@ def update_candidate_job(candidate_id: str, job_id: str, updates: dict) -> bool:
     return True
 
 
+def save_candidate_job_matches(job_id: str, matches: dict[str, dict]) -> None:
+    """Create-or-update candidate_jobs rows for one job in a single transaction.
+
+    ``matches`` maps candidate_id → column updates, in the same shape
+    ``update_candidate_job`` takes. Missing links are created first.
+    """
+    if not matches:
+        return
+    now = datetime.now().isoformat()
+    conn = get_conn()
+    with conn:
+        conn.executemany(
+            """INSERT OR IGNORE INTO candidate_jobs
+               (id, candidate_id, job_id, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(uuid.uuid4().hex[:8], cid, job_id, now, now) for cid in matches],
+        )
+        # Rows updating the same columns share one UPDATE statement, so
+        # executemany prepares it once and only rebinds per row
+        by_columns: dict[tuple[str, ...], list[list]] = {}
+        for cid, updates in matches.items():
+            if not updates:
+                continue
+            params = [
+                _json_dumps(v) if k in ("strengths", "gaps") else v
+                for k, v in updates.items()
+            ]
+            params.extend([cid, job_id])
+            by_columns.setdefault(tuple(updates), []).append(params)
+        for columns, rows in by_columns.items():
+            sets = ", ".join(f"{k} = ?" for k in columns)
+            conn.executemany(
+                f"UPDATE candidate_jobs SET {sets} WHERE candidate_id = ? AND job_id = ?",
+                rows,
+            )
+    conn.close()
+
+
 def delete_candidate_job(candidate_id: str, job_id: str) -> bool:
     conn = get_conn()
     cur = conn.execute(
@@ -1019,8 +1211,8 @@ def list_pipeline_entries() -> list[dict]:
 
 def _row_to_candidate_job(row) -> dict:
     d = dict(row)
-    d["strengths"] = json.loads(d.get("strengths") or "[]")
-    d["gaps"] = json.loads(d.get("gaps") or "[]")
+    d["strengths"] = _json_loads(d.get("strengths") or "[]")
+    d["gaps"] = _json_loads(d.get("gaps") or "[]")
     d["match_score"] = d.get("match_score") or 0.0
     d.setdefault("job_title", "")
     d.setdefault("job_company", "")
@@ -1030,39 +1222,60 @@ def _row_to_candidate_job(row) -> dict:
 
 # ── Emails ─────────────────────────────────────────────────────────────────
 
+_INSERT_EMAIL_SQL = """INSERT INTO emails
+   (id, candidate_id, candidate_name, to_email, subject, body,
+    email_type, approved, sent, sent_at, reply_received, attachment_path,
+    message_id, reply_body, replied_at, created_at)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _email_params(e: dict) -> tuple:
+    return (
+        e["id"], e.get("candidate_id", ""), e.get("candidate_name", ""),
+        e.get("to_email", ""), e.get("subject", ""), e.get("body", ""),
+        e.get("email_type", "outreach"), int(e.get("approved", False)),
+        int(e.get("sent", False)), e.get("sent_at"),
+        int(e.get("reply_received", False)), e.get("attachment_path", ""),
+        e.get("message_id", ""), e.get("reply_body", ""), e.get("replied_at"),
+        e["created_at"],
+    )
+
+
 def insert_email(e: dict) -> None:
     conn = get_conn()
-    conn.execute(
-        """INSERT INTO emails
-           (id, candidate_id, candidate_name, to_email, subject, body,
-            email_type, approved, sent, sent_at, reply_received, attachment_path,
-            message_id, reply_body, replied_at, created_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            e["id"], e.get("candidate_id", ""), e.get("candidate_name", ""),
-            e.get("to_email", ""), e.get("subject", ""), e.get("body", ""),
-            e.get("email_type", "outreach"), int(e.get("approved", False)),
-            int(e.get("sent", False)), e.get("sent_at"),
-            int(e.get("reply_received", False)), e.get("attachment_path", ""),
-            e.get("message_id", ""), e.get("reply_body", ""), e.get("replied_at"),
-            e["created_at"],
-        ),
-    )
+    conn.execute(_INSERT_EMAIL_SQL, _email_params(e))
     conn.commit()
     conn.close()
 
 
-def list_emails(candidate_id: str | None = None) -> list[dict]:
+def insert_emails(emails: list[dict]) -> None:
+    """Insert several emails with one executemany in a single transaction."""
+    if not emails:
+        return
     conn = get_conn()
-    if candidate_id:
-        rows = conn.execute(
-            "SELECT * FROM emails WHERE candidate_id = ? ORDER BY created_at DESC",
-            (candidate_id,),
-        ).fetchall()
-    else:
-        rows = conn.execute("SELECT * FROM emails ORDER BY created_at DESC").fetchall()
+    with conn:
+        conn.executemany(_INSERT_EMAIL_SQL, [_email_params(e) for e in emails])
     conn.close()
-    return [_row_to_email(r) for r in rows]
+
+
+def iter_emails(candidate_id: str | None = None) -> Iterator[dict]:
+    """Stream emails newest first; see :func:`list_emails` for a list."""
+    conn = get_conn()
+    query = "SELECT * FROM emails"
+    params: list = []
+    if candidate_id:
+        query += " WHERE candidate_id = ?"
+        params.append(candidate_id)
+    query += " ORDER BY created_at DESC"
+    try:
+        for r in _iter_dicts(conn, query, params):
+            yield _row_to_email(r)
+    finally:
+        conn.close()
+
+
+def list_emails(candidate_id: str | None = None) -> list[dict]:
+    return list(iter_emails(candidate_id))
 
 
 def get_email(eid: str) -> dict | None:
@@ -1093,9 +1306,10 @@ def update_email(eid: str, updates: dict) -> bool:
 def list_sent_unreplied_emails() -> list[dict]:
     """Return sent emails that haven't received a reply yet."""
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM emails WHERE sent = 1 AND reply_received = 0 ORDER BY sent_at DESC"
-    ).fetchall()
+    )
     conn.close()
     return [_row_to_email(r) for r in rows]
 
@@ -1162,9 +1376,9 @@ def list_audit_logs(
         params.append(candidate_id)
     query += " ORDER BY created_at DESC LIMIT ?"
     params.append(limit)
-    rows = conn.execute(query, params).fetchall()
+    rows = _fetch_dicts(conn, query, params)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 # ── Chat Sessions ─────────────────────────────────────────────────────────
@@ -1181,12 +1395,13 @@ def insert_chat_session(session: dict) -> None:
 
 def list_chat_sessions(user_id: str) -> list[dict]:
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM chat_sessions WHERE user_id = ? ORDER BY updated_at DESC",
         (user_id,),
-    ).fetchall()
+    )
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_chat_session(session_id: str) -> dict | None:
@@ -1246,23 +1461,24 @@ def update_chat_message(msg_id: str, updates: dict) -> bool:
 def list_chat_messages(user_id: str, limit: int = 50, session_id: str | None = None) -> list[dict]:
     conn = get_conn()
     if session_id:
-        rows = conn.execute(
+        rows = _fetch_dicts(
+            conn,
             "SELECT * FROM chat_messages WHERE user_id = ? AND session_id = ? ORDER BY created_at DESC LIMIT ?",
             (user_id, session_id, limit),
-        ).fetchall()
+        )
     else:
-        rows = conn.execute(
+        rows = _fetch_dicts(
+            conn,
             "SELECT * FROM chat_messages WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
             (user_id, limit),
-        ).fetchall()
+        )
     conn.close()
     results = []
-    for r in reversed(rows):
-        d = dict(r)
+    for d in reversed(rows):
         # Parse action_json back to dict if present
         if d.get("action_json"):
             try:
-                d["action"] = json.loads(d["action_json"])
+                d["action"] = _json_loads(d["action_json"])
             except (json.JSONDecodeError, TypeError):
                 d["action"] = None
         else:
@@ -1273,6 +1489,21 @@ def list_chat_messages(user_id: str, limit: int = 50, session_id: str | None = N
     return results
 
 
+def count_chat_messages(user_id: str, session_id: str | None = None) -> int:
+    conn = get_conn()
+    if session_id:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM chat_messages WHERE user_id = ? AND session_id = ?",
+            (user_id, session_id),
+        ).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM chat_messages WHERE user_id = ?", (user_id,)
+        ).fetchone()
+    conn.close()
+    return row[0]
+
+
 def clear_chat_messages(user_id: str) -> None:
     conn = get_conn()
     conn.execute("DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
@@ -1295,12 +1526,13 @@ def insert_activity(a: dict) -> None:
 
 def list_activities(user_id: str, limit: int = 50) -> list[dict]:
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM activities WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
         (user_id, limit),
-    ).fetchall()
+    )
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 # ── Memories ──────────────────────────────────────────────────────────
@@ -1322,17 +1554,19 @@ def insert_memory(m: dict) -> None:
 def list_memories(user_id: str, memory_type: str | None = None, limit: int = 15) -> list[dict]:
     conn = get_conn()
     if memory_type:
-        rows = conn.execute(
+        rows = _fetch_dicts(
+            conn,
             "SELECT * FROM memories WHERE user_id = ? AND memory_type = ? ORDER BY confidence DESC, updated_at DESC LIMIT ?",
             (user_id, memory_type, limit),
-        ).fetchall()
+        )
     else:
-        rows = conn.execute(
+        rows = _fetch_dicts(
+            conn,
             "SELECT * FROM memories WHERE user_id = ? ORDER BY confidence DESC, updated_at DESC LIMIT ?",
             (user_id, limit),
-        ).fetchall()
+        )
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_memory(memory_id: str) -> dict | None:
@@ -1396,9 +1630,9 @@ def list_events(month: str | None = None, candidate_id: str | None = None, job_i
         query += " AND job_id = ?"
         params.append(job_id)
     query += " ORDER BY start_time ASC"
-    rows = conn.execute(query, params).fetchall()
+    rows = _fetch_dicts(conn, query, params)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_event(eid: str) -> dict | None:
@@ -1447,7 +1681,7 @@ def insert_job_seeker_profile(profile: dict) -> None:
             profile["id"], profile["user_id"], profile.get("name", ""),
             profile.get("email", ""), profile.get("phone", ""),
             profile.get("current_title", ""), profile.get("current_company", ""),
-            json.dumps(profile.get("skills", [])), profile.get("experience_years"),
+            _json_dumps(profile.get("skills", [])), profile.get("experience_years"),
             profile.get("location", ""), profile.get("resume_summary", ""),
             profile.get("resume_path", ""), profile.get("raw_resume_text", ""),
             profile["created_at"], profile["updated_at"],
@@ -1466,7 +1700,7 @@ def get_job_seeker_profile_by_user(user_id: str) -> dict | None:
     if not row:
         return None
     d = dict(row)
-    d["skills"] = json.loads(d["skills"] or "[]")
+    d["skills"] = _json_loads(d["skills"] or "[]")
     return d
 
 
@@ -1482,7 +1716,7 @@ def upsert_job_seeker_profile(user_id: str, data: dict) -> dict:
         params = []
         for k, v in updates.items():
             if k == "skills":
-                v = json.dumps(v)
+                v = _json_dumps(v)
             sets.append(f"{k} = ?")
             params.append(v)
         params.append(existing["id"])
@@ -1505,8 +1739,9 @@ def upsert_job_seeker_profile(user_id: str, data: dict) -> dict:
 # ── Seeker Jobs ───────────────────────────────────────────────────────────
 
 def _enrich_seeker_job(d: dict) -> dict:
-    d["required_skills"] = json.loads(d["required_skills"] or "[]")
-    d["preferred_skills"] = json.loads(d["preferred_skills"] or "[]")
+    d["required_skills"] = _json_loads(d["required_skills"] or "[]")
+    d["preferred_skills"] = _json_loads(d["preferred_skills"] or "[]")
+    d["raw_text"] = _unpack_text(d["raw_text"])
     d["remote"] = bool(d["remote"])
     d.setdefault("posted_date", "")
     return d
@@ -1523,12 +1758,12 @@ def insert_seeker_job(job: dict) -> None:
         (
             job["id"], job["user_id"], job.get("title", ""),
             job.get("company", ""), job.get("posted_date", ""),
-            json.dumps(job.get("required_skills", [])),
-            json.dumps(job.get("preferred_skills", [])),
+            _json_dumps(job.get("required_skills", [])),
+            _json_dumps(job.get("preferred_skills", [])),
             job.get("experience_years"),
             job.get("location", ""), int(job.get("remote", False)),
             job.get("salary_range", ""), job.get("summary", ""),
-            job.get("raw_text", ""), job.get("source_url", ""),
+            _pack_text(job.get("raw_text", "")), job.get("source_url", ""),
             job.get("status", "interested"), job["created_at"],
         ),
     )
@@ -1538,12 +1773,13 @@ def insert_seeker_job(job: dict) -> None:
 
 def list_seeker_jobs(user_id: str) -> list[dict]:
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM seeker_jobs WHERE user_id = ? ORDER BY created_at DESC",
         (user_id,),
-    ).fetchall()
+    )
     conn.close()
-    return [_enrich_seeker_job(dict(r)) for r in rows]
+    return [_enrich_seeker_job(r) for r in rows]
 
 
 def get_seeker_job(job_id: str) -> dict | None:
@@ -1618,12 +1854,13 @@ def get_active_workflow(session_id: str) -> dict | None:
 
 def list_workflows(user_id: str, limit: int = 20) -> list[dict]:
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM workflows WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
         (user_id, limit),
-    ).fetchall()
+    )
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 # ── Automation Rules ──────────────────────────────────────────────────────
@@ -1740,9 +1977,9 @@ def list_automation_logs(
         params.append(rule_id)
     query += " ORDER BY created_at DESC LIMIT ?"
     params.append(limit)
-    rows = conn.execute(query, params).fetchall()
+    rows = _fetch_dicts(conn, query, params)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def update_automation_log(log_id: str, updates: dict) -> bool:
@@ -1761,9 +1998,15 @@ def update_automation_log(log_id: str, updates: dict) -> bool:
 def insert_session_summary(s: dict) -> None:
     conn = get_conn()
     conn.execute(
-        "INSERT OR REPLACE INTO session_summaries (id, session_id, user_id, summary, topics, entity_refs, message_count, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        """INSERT INTO session_summaries
+           (id, session_id, user_id, summary, topics, entity_refs, message_count, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(session_id) DO UPDATE SET
+               id = excluded.id, user_id = excluded.user_id, summary = excluded.summary,
+               topics = excluded.topics, entity_refs = excluded.entity_refs,
+               message_count = excluded.message_count, created_at = excluded.created_at""",
         (s["id"], s["session_id"], s["user_id"], s["summary"],
-         json.dumps(s.get("topics", [])), json.dumps(s.get("entity_refs", {})),
+         _json_dumps(s.get("topics", [])), _json_dumps(s.get("entity_refs", {})),
          s.get("message_count", 0), s["created_at"]),
     )
     conn.commit()
@@ -1777,23 +2020,23 @@ def get_session_summary(session_id: str) -> dict | None:
     if not row:
         return None
     d = dict(row)
-    d["topics"] = json.loads(d.get("topics") or "[]")
-    d["entity_refs"] = json.loads(d.get("entity_refs") or "{}")
+    d["topics"] = _json_loads(d.get("topics") or "[]")
+    d["entity_refs"] = _json_loads(d.get("entity_refs") or "{}")
     return d
 
 
 def list_session_summaries(user_id: str, limit: int = 20) -> list[dict]:
     conn = get_conn()
-    rows = conn.execute(
+    rows = _fetch_dicts(
+        conn,
         "SELECT * FROM session_summaries WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
         (user_id, limit),
-    ).fetchall()
+    )
     conn.close()
     results = []
-    for r in rows:
-        d = dict(r)
-        d["topics"] = json.loads(d.get("topics") or "[]")
-        d["entity_refs"] = json.loads(d.get("entity_refs") or "{}")
+    for d in rows:
+        d["topics"] = _json_loads(d.get("topics") or "[]")
+        d["entity_refs"] = _json_loads(d.get("entity_refs") or "{}")
         results.append(d)
     return results
 
@@ -1814,8 +2057,8 @@ def get_session_state(session_id: str) -> dict | None:
     if not row:
         return None
     d = dict(row)
-    d["open_workflows"] = json.loads(d.get("open_workflows_json") or "[]")
-    d["focused_entities"] = json.loads(d.get("focused_entities_json") or "[]")
+    d["open_workflows"] = _json_loads(d.get("open_workflows_json") or "[]")
+    d["focused_entities"] = _json_loads(d.get("focused_entities_json") or "[]")
     return d
 
 
@@ -1828,36 +2071,34 @@ def upsert_session_state(session_id: str, user_id: str, updates: dict) -> None:
     open_workflows = updates.get("open_workflows")
     focused_entities = updates.get("focused_entities")
 
+    # On conflict only the columns present in *updates* are overwritten
+    sets = []
+    if "current_goal" in updates:
+        sets.append("current_goal = excluded.current_goal")
+    if open_workflows is not None:
+        sets.append("open_workflows_json = excluded.open_workflows_json")
+    if focused_entities is not None:
+        sets.append("focused_entities_json = excluded.focused_entities_json")
+    if "scratchpad" in updates:
+        sets.append("scratchpad = excluded.scratchpad")
+    sets.append("updated_at = excluded.updated_at")
+
     conn = get_conn()
-    existing = conn.execute("SELECT session_id FROM session_state WHERE session_id = ?", (session_id,)).fetchone()
-    if existing:
-        sets, vals = [], []
-        if "current_goal" in updates:
-            sets.append("current_goal = ?"); vals.append(updates["current_goal"])
-        if open_workflows is not None:
-            sets.append("open_workflows_json = ?"); vals.append(json.dumps(open_workflows))
-        if focused_entities is not None:
-            sets.append("focused_entities_json = ?"); vals.append(json.dumps(focused_entities))
-        if "scratchpad" in updates:
-            sets.append("scratchpad = ?"); vals.append(updates["scratchpad"])
-        sets.append("updated_at = ?"); vals.append(now)
-        vals.append(session_id)
-        conn.execute(f"UPDATE session_state SET {', '.join(sets)} WHERE session_id = ?", vals)
-    else:
-        conn.execute(
-            """INSERT INTO session_state
-               (session_id, user_id, current_goal, open_workflows_json,
-                focused_entities_json, scratchpad, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                session_id, user_id,
-                updates.get("current_goal", ""),
-                json.dumps(open_workflows or []),
-                json.dumps(focused_entities or []),
-                updates.get("scratchpad", ""),
-                now,
-            ),
-        )
+    conn.execute(
+        f"""INSERT INTO session_state
+            (session_id, user_id, current_goal, open_workflows_json,
+             focused_entities_json, scratchpad, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET {', '.join(sets)}""",
+        (
+            session_id, user_id,
+            updates.get("current_goal", ""),
+            _json_dumps(open_workflows or []),
+            _json_dumps(focused_entities or []),
+            updates.get("scratchpad", ""),
+            now,
+        ),
+    )
     conn.commit()
     conn.close()
 
@@ -1874,8 +2115,8 @@ def get_entity_memory(user_id: str, entity_type: str, entity_id: str) -> dict |
     if not row:
         return None
     d = dict(row)
-    d["traits"] = json.loads(d.get("traits_json") or "{}")
-    d["relations"] = json.loads(d.get("relations_json") or "[]")
+    d["traits"] = _json_loads(d.get("traits_json") or "{}")
+    d["relations"] = _json_loads(d.get("relations_json") or "[]")
     return d
 
 
@@ -1903,7 +2144,7 @@ def upsert_entity_memory(user_id: str, entity_type: str, entity_id: str, updates
                SET summary = ?, traits_json = ?, relations_json = ?,
                    interaction_count = ?, last_interaction_at = ?, updated_at = ?
                WHERE user_id = ? AND entity_type = ? AND entity_id = ?""",
-            (summary, json.dumps(traits), json.dumps(relations),
+            (summary, _json_dumps(traits), _json_dumps(relations),
              interaction_count, last_interaction, now,
              user_id, entity_type, entity_id),
         )
@@ -1920,8 +2161,8 @@ def upsert_entity_memory(user_id: str, entity_type: str, entity_id: str, updates
             (
                 uuid.uuid4().hex[:8], user_id, entity_type, entity_id,
                 updates.get("summary", ""),
-                json.dumps(updates.get("traits", {})),
-                json.dumps(updates.get("relations", [])),
+                _json_dumps(updates.get("traits", {})),
+                _json_dumps(updates.get("relations", [])),
                 1 if updates.get("bump_interaction") else 0,
                 now if updates.get("bump_interaction") else None,
                 now,
@@ -1939,3 +2180,52 @@ def get_entity_memories_for(user_id: str, refs: list[tuple[str, str]]) -> list[d
         if m:
             results.append(m)
     return results
+
+
+# ── JD Parse Cache ────────────────────────────────────────────────────────
+
+def get_jd_parse(content_hash: str) -> dict | None:
+    conn = get_conn()
+    row = conn.execute(
+        "SELECT data FROM jd_parse_cache WHERE hash = ?", (content_hash,)
+    ).fetchone()
+    conn.close()
+    return _json_loads(row["data"]) if row else None
+
+
+def put_jd_parse(content_hash: str, data: dict) -> None:
+    conn = get_conn()
+    conn.execute(
+        "INSERT INTO jd_parse_cache (hash, data, created_at) VALUES (?, ?, ?)"
+        " ON CONFLICT(hash) DO UPDATE SET data = excluded.data, created_at = excluded.created_at",
+        (content_hash, _json_dumps(data), datetime.now().isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_match_results(content_hashes: list[str]) -> dict[str, dict]:
+    """Return cached match results for whichever of *content_hashes* are stored."""
+    if not content_hashes:
+        return {}
+    conn = get_conn()
+    rows = conn.execute(
+        "SELECT hash, data FROM match_cache WHERE hash IN (SELECT value FROM json_each(?))",
+        (_json_dumps(content_hashes),),
+    ).fetchall()
+    conn.close()
+    return {r["hash"]: _json_loads(r["data"]) for r in rows}
+
+
+def put_match_results(results: dict[str, dict]) -> None:
+    if not results:
+        return
+    now = datetime.now().isoformat()
+    conn = get_conn()
+    with conn:
+        conn.executemany(
+            "INSERT INTO match_cache (hash, data, created_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(hash) DO UPDATE SET data = excluded.data, created_at = excluded.created_at",
+            [(h, _json_dumps(data), now) for h, data in results.items()],
+        )
+    conn.close()
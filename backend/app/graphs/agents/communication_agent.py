@@ -45,6 +45,7 @@ from langgraph.graph import END, StateGraph
 from app import database as db
 from app.graphs.state import CommunicationAgentState
 from app.llm import chat_json
+from app.models import EmailDraft
 from app.prompts import DRAFT_EMAIL_ENHANCED
 
 log = logging.getLogger(__name__)
@@ -170,6 +171,7 @@ def draft_email(state: CommunicationAgentState) -> dict:
             cfg,
             system=DRAFT_EMAIL_ENHANCED,
             messages=[{"role": "user", "content": user_msg}],
+            schema=EmailDraft,
         )
     except Exception as e:
         log.error("Communication Agent LLM call failed: %s", e)
@@ -110,6 +110,7 @@ def load_context(state: JobMatchAgentState) -> dict:
 def evaluate(state: JobMatchAgentState) -> dict:
     """Use LLM to evaluate the candidate-job match."""
     from app.llm import chat_json
+    from app.models import MatchResult
     from app.prompts import MATCHING
 
     # Short-circuit if already errored
@@ -144,7 +145,9 @@ def evaluate(state: JobMatchAgentState) -> dict:
     )
 
     try:
-        match_data = chat_json(cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}])
+        match_data = chat_json(
+            cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}], schema=MatchResult,
+        )
         if isinstance(match_data, list):
             match_data = match_data[0] if match_data else {}
 
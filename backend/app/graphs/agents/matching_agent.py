@@ -4,7 +4,7 @@ Wraps the existing agents/matching.py logic as a 4-node LangGraph StateGraph:
 
     ┌──────────────┐     ┌──────────────┐     ┌──────────────┐     ┌────────────┐
     │  load_context │────▶│ vector_rank  │────▶│  llm_score   │────▶│  finalize  │
-    │  (DB lookup)  │     │ (ChromaDB)   │     │ (per-cand.)  │     │  (output)  │
+    │  (DB lookup)  │     │ (ChromaDB)   │     │  (batched)   │     │  (output)  │
     └──────────────┘     └──────────────┘     └──────────────┘     └────────────┘
 
 Nodes:
@@ -12,9 +12,10 @@ Nodes:
   2. vector_rank   — Calls vectorstore.search_candidates_for_job() to get
                      a ranked list of candidates by semantic similarity.
                      This is a fast, cheap pre-filter (no LLM call).
-  3. llm_score     — For each candidate in the ranked list, calls
-                     matching.match_candidate_to_job() to get a detailed
-                     LLM evaluation (score, strengths, gaps, reasoning).
+  3. llm_score     — Calls matching.match_candidates_to_job() on the ranked
+                     list to get a detailed LLM evaluation (score,
+                     strengths, gaps, reasoning) — several candidates per
+                     LLM call rather than one call each.
   4. finalize      — Packs the results into agent_output for the Supervisor.
 
 This agent is the most complex specialist because it combines two stages:
@@ -44,7 +45,7 @@ from langgraph.graph import END, StateGraph
 
 from app import database as db
 from app import vectorstore
-from app.agents.matching import match_candidate_to_job
+from app.agents.matching import match_candidates_to_job
 from app.graphs.state import MatchingAgentState
 
 log = logging.getLogger(__name__)
@@ -133,11 +134,11 @@ def vector_rank(state: MatchingAgentState) -> dict:
 
 
 # ── Node 3: llm_score ────────────────────────────────────────────────────
-# For each candidate from the vector search, calls the LLM to produce a
-# detailed evaluation: score (0.0-1.0), strengths, gaps, and reasoning.
+# Calls the LLM to produce a detailed evaluation for every candidate from
+# the vector search: score (0.0-1.0), strengths, gaps, and reasoning.
 #
-# This reuses the existing match_candidate_to_job() function from
-# agents/matching.py — no logic duplication needed.
+# This reuses match_candidates_to_job() from agents/matching.py, which
+# batches candidates into as few LLM calls as possible.
 
 def llm_score(state: MatchingAgentState) -> dict:
     """Run detailed LLM matching for each candidate in the ranked list."""
@@ -145,13 +146,17 @@ def llm_score(state: MatchingAgentState) -> dict:
     job_id = state["job_id"]
     rankings = state.get("vector_rankings", [])
 
+    matches = match_candidates_to_job(
+        cfg, job_id, [r["candidate_id"] for r in rankings if r.get("candidate_id")],
+    )
+
     detailed: list[dict] = []
     for rank_entry in rankings:
         cid = rank_entry.get("candidate_id", "")
         if not cid:
             continue
 
-        result = match_candidate_to_job(cfg, job_id, cid)
+        result = matches.get(cid, {})
         detailed.append({
             "candidate_id": cid,
             "candidate_name": rank_entry.get("candidate_name", ""),
@@ -70,11 +70,8 @@ def scan(state: PipelineAgentState) -> dict:
     days_stale = state.get("days_stale") or agent_input.get("days_stale", DEFAULT_DAYS_STALE)
     cutoff = (datetime.now() - timedelta(days=days_stale)).isoformat()
 
-    all_candidates = db.list_candidates()
     stale = []
-    for c in all_candidates:
-        if c.get("status") != "contacted":
-            continue
+    for c in db.iter_candidate_rows(status="contacted"):
         updated = c.get("updated_at") or c.get("created_at", "")
         if updated and updated < cutoff:
             stale.append(c)
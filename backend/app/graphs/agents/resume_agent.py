@@ -36,6 +36,7 @@ from langgraph.graph import END, StateGraph
 
 from app.graphs.state import ResumeAgentState
 from app.llm import chat_json
+from app.models import ParsedResume
 from app.prompts import PARSE_RESUME
 
 log = logging.getLogger(__name__)
@@ -62,6 +63,7 @@ def extract_resume(state: ResumeAgentState) -> dict:
             cfg,
             system=PARSE_RESUME,
             messages=[{"role": "user", "content": raw_text}],
+            schema=ParsedResume,
         )
     except Exception as e:
         log.error("Resume Agent LLM call failed: %s", e)
@@ -51,7 +51,7 @@ from langgraph.graph import END, StateGraph
 from app import database as db
 from app.graphs.state import ChatState
 from app.llm import chat, chat_json
-from app.prompts import CHAT_SYSTEM_WITH_ACTIONS
+from app.prompts import render_chat_system_with_actions
 
 # Job seeker action whitelist — only these actions are allowed for seekers
 _SEEKER_ALLOWED_ACTIONS = {"search_jobs", "analyze_job_match", "save_job"}
@@ -87,14 +87,14 @@ def build_context(state: ChatState) -> dict:
 
     # Build role-specific system prompt
     if user_role == "job_seeker":
-        from app.prompts import CHAT_SYSTEM_JOB_SEEKER, ENCOURAGEMENT_ADDENDUM
+        from app.prompts import render_chat_system_job_seeker, render_chat_system_job_seeker_encouraged
         context = _build_job_seeker_context(user_id, session_id=session_id)
-        rag_context = CHAT_SYSTEM_JOB_SEEKER.format(context=context)
-        if state.get("encouragement_mode"):
-            rag_context += ENCOURAGEMENT_ADDENDUM
+        render = (render_chat_system_job_seeker_encouraged if state.get("encouragement_mode")
+                  else render_chat_system_job_seeker)
+        rag_context = render(context=context)
     else:
         context = _build_pipeline_context(user_id, current_message=user_message, session_id=session_id)
-        rag_context = CHAT_SYSTEM_WITH_ACTIONS.format(context=context)
+        rag_context = render_chat_system_with_actions(context=context)
 
     return {
         "conversation_history": conversation_history,
@@ -268,8 +268,7 @@ def output_guard(state: ChatState) -> dict:
     known_candidates = []
     known_job_ids = []
     try:
-        candidates = db.list_candidates() or []
-        known_candidates = [c.get("name", "") for c in candidates if c.get("name")]
+        known_candidates = [c.get("name", "") for c in db.iter_candidate_rows() if c.get("name")]
         jobs = db.list_jobs() or []
         known_job_ids = [j.get("id", "") for j in jobs if j.get("id")]
     except Exception:
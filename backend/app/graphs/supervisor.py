@@ -40,8 +40,11 @@ HTTP requests via thread_id.
 
 from __future__ import annotations
 
+import copy
 import logging
 import re
+import threading
+from collections import Counter, OrderedDict
 
 from langgraph.graph import END, StateGraph
 from langgraph.types import interrupt
@@ -81,6 +84,39 @@ _WORKFLOW_PATTERNS = {
     ),
 }
 
+# Messages that are confidently plain chat — greetings / acknowledgements and
+# bare single-entity lookups ("how many candidates?"). These skip the LLM
+# classifier; anything longer or with qualifiers goes to the classifier.
+_CHAT_PATTERNS = (
+    re.compile(
+        r"^\s*(hi|hello|hey|thanks|thank you|thx|ok|okay|got it|cool|great|"
+        r"good (morning|afternoon|evening)|你好|您好|谢谢|好的)[\s!.,。！，~]*$",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"^\s*(what(?:'s| is| are)|how many|show( me)?|list|查看|有多少|显示)\s*"
+        r"((the|our|all|my)\s+)?"
+        r"((pipeline\s+)?status|pipeline|candidates?|jobs?|emails|候选人|职位|岗位|邮件|状态)"
+        r"(\s+(do we have|are there|in the pipeline))?[\s?？!.。]*$",
+        re.IGNORECASE,
+    ),
+)
+# Action verbs, conjunctions, lists and multi-sentence messages always go to
+# the LLM — they may be a workflow or need a plan.
+_NOT_CHAT_RE = re.compile(
+    r"\b(draft|email|send|schedule|match|find|search|and|then|after that|"
+    r"also|afterwards|next)\b|[,，;；、]|[.?!。？！]\s*\S|然后|之后|接着|并且|和",
+    re.IGNORECASE,
+)
+
+
+def _is_plain_chat(user_message: str) -> bool:
+    """Return True when *user_message* can be routed to chat without the LLM."""
+    if _NOT_CHAT_RE.search(user_message):
+        return False
+    return any(p.search(user_message) for p in _CHAT_PATTERNS)
+
+
 CLASSIFY_INTENT_PROMPT = """\
 You are a routing assistant. Classify the user's message into one of these intents:
 
@@ -96,7 +132,6 @@ Return JSON:
   "workflow_type": "bulk_outreach" | "candidate_review" | "job_search" | "job_match" | ... | null,
   "reasoning": "one sentence explanation"
 }
-Only output valid JSON.
 """
 
 PLAN_GENERATION_PROMPT = """\
@@ -114,6 +149,8 @@ Available agents:
 
 Create a plan with ordered steps. Each step assigns one agent.
 Steps can be "sequential" (wait for previous), "parallel" (run concurrently), or "interrupt" (needs user approval).
+Set "depends_on" to the step numbers whose output a step needs ([] if none). \
+Steps whose dependencies are all done run at the same time, so only list real data dependencies.
 
 Return JSON:
 {
@@ -121,11 +158,10 @@ Return JSON:
   "workflow_type": "the primary workflow type or 'multi'",
   "agents_required": ["agent1", "agent2"],
   "steps": [
-    {"step": 1, "agent": "agent_name", "action": "what to do", "mode": "sequential|parallel|interrupt"}
+    {"step": 1, "agent": "agent_name", "action": "what to do", "mode": "sequential|parallel|interrupt", "depends_on": []}
   ],
   "requires_approval": true
 }
-Only output valid JSON.
 """
 
 
@@ -157,8 +193,8 @@ def check_paused(state: PlannerState) -> dict:
 
 # ── Node 2: classify_intent ──────────────────────────────────────────────
 # Determines what the user wants. First tries keyword matching for direct
-# workflow triggers, then falls back to LLM classification for ambiguous
-# messages.
+# workflow triggers and obvious plain chat, then falls back to LLM
+# classification for ambiguous messages.
 
 def classify_intent(state: PlannerState) -> dict:
     """Classify user intent: chat, workflow, or plan."""
@@ -175,6 +211,15 @@ def classify_intent(state: PlannerState) -> dict:
                 "steps_completed": [*(state.get("steps_completed") or []), "classify_intent"],
             }
 
+    # Fast path: greetings and simple lookups are plain chat
+    if _is_plain_chat(user_message):
+        return {
+            "plan_status": "chat",
+            "plan": {"intent": INTENT_CHAT},
+            "current_step": "classify_intent",
+            "steps_completed": [*(state.get("steps_completed") or []), "classify_intent"],
+        }
+
     # LLM classification for ambiguous messages
     try:
         result = chat_json(
@@ -240,21 +285,65 @@ def route_to_chat(state: PlannerState) -> dict:
 
 # ── Node 4: generate_plan ────────────────────────────────────────────────
 # For complex multi-step tasks, calls the LLM to generate a structured
-# execution plan with agent assignments.
+# execution plan with agent assignments. Plans are kept in a small LRU
+# keyed by the normalised request, so repeating a request skips the LLM.
+
+_PLAN_CACHE_SIZE = 256
+_plan_cache: OrderedDict[str, dict] = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+def _plan_key(cfg, user_message: str) -> str:
+    """Case- and whitespace-insensitive key for *user_message*.
+
+    Names, digits and punctuation are kept exactly ("score > 0.8" and
+    "score < 0.8" are different requests; plan step actions mention the
+    specifics), so only a request with the same wording may reuse a plan.
+    """
+    text = " ".join(user_message.lower().split())
+    return f"{cfg.llm_provider}\0{cfg.llm_model}\0{text}"
+
+
+def _cached_plan(key: str) -> dict | None:
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is None:
+            return None
+        _plan_cache.move_to_end(key)
+    return copy.deepcopy(plan)
+
+
+def _forget_plan(key: str) -> None:
+    with _plan_cache_lock:
+        _plan_cache.pop(key, None)
+
+
+def _remember_plan(key: str, plan: dict) -> None:
+    with _plan_cache_lock:
+        _plan_cache[key] = copy.deepcopy(plan)
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+
 
 def generate_plan(state: PlannerState) -> dict:
     """Generate a structured execution plan for complex tasks."""
     cfg = state["cfg"]
     user_message = state.get("user_message", "")
 
+    key = _plan_key(cfg, user_message)
+    plan = _cached_plan(key)
     try:
-        plan = chat_json(
-            cfg,
-            system=PLAN_GENERATION_PROMPT,
-            messages=[{"role": "user", "content": user_message}],
-        )
-        if isinstance(plan, list):
-            plan = plan[0] if plan else {}
+        if plan is None:
+            plan = chat_json(
+                cfg,
+                system=PLAN_GENERATION_PROMPT,
+                messages=[{"role": "user", "content": user_message}],
+            )
+            if isinstance(plan, list):
+                plan = plan[0] if plan else {}
+            validate_plan(plan.get("steps") or [])
+            if plan.get("steps"):
+                _remember_plan(key, plan)
     except Exception as e:
         log.error("Plan generation failed: %s", e)
         return {
@@ -288,6 +377,10 @@ def present_plan(state: PlannerState) -> dict:
 
     decision = response.get("decision", "cancel")
 
+    if decision in ("cancel", "modify"):
+        # The user rejected this plan — don't serve it again for the same request
+        _forget_plan(_plan_key(state["cfg"], state.get("user_message", "")))
+
     if decision == "cancel":
         return {
             "plan_status": "cancelled",
@@ -308,8 +401,13 @@ def present_plan(state: PlannerState) -> dict:
 
 # ── Node 6: dispatch_agents ──────────────────────────────────────────────
 # Executes the approved plan by invoking specialist agents.
-# Steps marked as "parallel" are grouped and executed concurrently
-# via ThreadPoolExecutor. Sequential/interrupt steps run one-by-one.
+# Plans with "depends_on" run in dependency phases: every step whose
+# dependencies are done runs concurrently via ThreadPoolExecutor. Older
+# plans without it fall back to the "mode" grouping (parallel runs
+# together, sequential/interrupt steps one-by-one).
+
+# Upper bound on agents running at once within one phase
+_MAX_PARALLEL_AGENTS = 4
 
 def _get_agent_graphs() -> dict:
     """Lazy import of agent subgraphs to avoid circular imports."""
@@ -346,7 +444,8 @@ def _invoke_agent(agent_graph, agent_input: dict) -> dict:
 def _group_steps(steps: list[dict]) -> list[list[dict]]:
     """Group plan steps into execution batches.
 
-    Consecutive steps with mode="parallel" are grouped into the same
+    If any step declares ``depends_on``, batches are dependency phases
+    (see :func:`_phase_steps`). Otherwise consecutive steps with mode="parallel" are grouped into the same
     batch and run concurrently.  Sequential/interrupt steps each form
     their own single-item batch.
 
@@ -358,6 +457,9 @@ def _group_steps(steps: list[dict]) -> list[list[dict]]:
             {mode: "sequential"},  # batch 2 (alone)
         ]
     """
+    if any("depends_on" in step for step in steps):
+        return _phase_steps(steps)
+
     batches: list[list[dict]] = []
     current_parallel: list[dict] = []
 
@@ -378,12 +480,114 @@ def _group_steps(steps: list[dict]) -> list[list[dict]]:
     return batches
 
 
+def _step_ref(value) -> int | None:
+    """Step number from an LLM plan value (``1`` or ``"1"``), else None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        ref = int(value)
+    except (TypeError, ValueError):
+        return None
+    return ref if isinstance(value, str) or ref == value else None
+
+
+def _kahn_layers(steps: list[dict]) -> tuple[list[list[int]], list[int], list[str]]:
+    """Kahn's algorithm over the ``depends_on`` references of *steps*, O(V+E).
+
+    Steps are referenced by their ``step`` number (1-based position if
+    missing or not a number); numbers given as strings are converted.
+    Returns ``(layers, leftover, problems)``: step indexes per phase,
+    indexes stuck in a cycle, and descriptions of invalid, unknown or self
+    references (which are left out of the graph).
+    """
+    problems: list[str] = []
+    ids: list[int] = []
+    for i, step in enumerate(steps):
+        sid = _step_ref(step.get("step", i + 1))
+        if sid is None:
+            problems.append(f"step at position {i + 1} has invalid number {step.get('step')!r}")
+            sid = i + 1
+        ids.append(sid)
+    index = {sid: i for i, sid in enumerate(ids)}
+    in_degree = [0] * len(steps)
+    dependents: list[list[int]] = [[] for _ in steps]
+    for i, step in enumerate(steps):
+        raw = step.get("depends_on") or []
+        if not isinstance(raw, list):
+            raw = [raw]
+        deps: set[int] = set()
+        for value in raw:
+            dep = _step_ref(value)
+            if dep is None:
+                problems.append(f"step {ids[i]} has invalid dependency {value!r}")
+            else:
+                deps.add(dep)
+        for dep in deps:
+            j = index.get(dep)
+            if j is None:
+                problems.append(f"step {ids[i]} depends on unknown step {dep}")
+            elif j == i:
+                problems.append(f"step {ids[i]} depends on itself")
+            else:
+                in_degree[i] += 1
+                dependents[j].append(i)
+
+    layers: list[list[int]] = []
+    ready = [i for i, degree in enumerate(in_degree) if degree == 0]
+    while ready:
+        layers.append(ready)
+        next_ready = []
+        for i in ready:
+            for k in dependents[i]:
+                in_degree[k] -= 1
+                if in_degree[k] == 0:
+                    next_ready.append(k)
+        ready = sorted(next_ready)
+
+    leftover = [i for i, degree in enumerate(in_degree) if degree > 0]
+    return layers, leftover, problems
+
+
+def validate_plan(steps: list[dict]) -> list[list[dict]]:
+    """Check a ``depends_on`` plan up front and return its phases.
+
+    Raises ``ValueError`` if a step references an unknown step or itself,
+    or if the dependencies contain a cycle. Plans without ``depends_on``
+    use mode grouping and are returned as :func:`_group_steps` batches.
+    """
+    if not any("depends_on" in step for step in steps):
+        return _group_steps(steps)
+    layers, leftover, problems = _kahn_layers(steps)
+    if leftover:
+        ids = [steps[i].get("step", i + 1) for i in leftover]
+        problems.append(f"dependency cycle between steps {ids}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return [[steps[i] for i in layer] for layer in layers]
+
+
+def _phase_steps(steps: list[dict]) -> list[list[dict]]:
+    """Layer a ``depends_on`` plan into phases with Kahn's algorithm.
+
+    Phase N holds every step whose dependencies all finished in phases
+    before N, so independent steps share a phase and run concurrently.
+    Unknown references are ignored. If a cycle is left over, the
+    remaining steps run one-by-one in plan order.
+    """
+    layers, leftover, _ = _kahn_layers(steps)
+    batches = [[steps[i] for i in layer] for layer in layers]
+    if leftover:
+        log.warning("Plan has a dependency cycle; running remaining steps in order")
+        batches.extend([steps[i]] for i in leftover)
+    return batches
+
+
 def dispatch_agents(state: PlannerState) -> dict:
     """Dispatch specialist agents according to the approved plan.
 
-    Parallel steps are run concurrently using a ThreadPoolExecutor.
-    Sequential steps run one after another. Each batch can read
-    previous_results from earlier batches.
+    Steps in the same batch (see :func:`_group_steps`) run concurrently
+    using a ThreadPoolExecutor; batches run one after another. Each batch
+    can read previous_results from earlier batches.
     """
     import concurrent.futures
 
@@ -416,13 +620,16 @@ def dispatch_agents(state: PlannerState) -> dict:
             if isinstance(result, dict) and result.get("error"):
                 log.error("Agent %s failed: %s", agent_name, result["error"])
         else:
-            # Parallel batch — fan out with ThreadPoolExecutor
+            # Parallel batch — fan out with ThreadPoolExecutor. A phase can
+            # hold several steps for the same agent; those are keyed
+            # "agent#step" so one step's result doesn't overwrite another's.
+            counts = Counter(step.get("agent", "") for step in batch)
             futures: dict[str, concurrent.futures.Future] = {}
             with concurrent.futures.ThreadPoolExecutor(
-                max_workers=len(batch),
+                max_workers=min(len(batch), _MAX_PARALLEL_AGENTS),
                 thread_name_prefix="agent",
             ) as executor:
-                for step in batch:
+                for i, step in enumerate(batch, 1):
                     agent_name = step.get("agent", "")
                     agent_graph = agent_graphs.get(agent_name)
                     if not agent_graph:
@@ -434,16 +641,19 @@ def dispatch_agents(state: PlannerState) -> dict:
                         "session_id": state.get("session_id", ""),
                         "user_id": state.get("user_id", ""),
                     }
-                    futures[agent_name] = executor.submit(
+                    key = agent_name
+                    if counts[agent_name] > 1:
+                        key = f"{agent_name}#{step.get('step', i)}"
+                    futures[key] = executor.submit(
                         _invoke_agent, agent_graph, agent_input,
                     )
 
             # Collect results after all futures complete
-            for agent_name, future in futures.items():
+            for key, future in futures.items():
                 result = future.result()
-                agent_results[agent_name] = result
+                agent_results[key] = result
                 if isinstance(result, dict) and result.get("error"):
-                    log.error("Agent %s failed: %s", agent_name, result["error"])
+                    log.error("Agent %s failed: %s", key, result["error"])
 
     return {
         "agent_results": agent_results,
@@ -122,9 +122,8 @@ class ActionLimits(BaseGuardrail):
         """Check daily email sending rate limit."""
         today = datetime.now().strftime("%Y-%m-%d")
         try:
-            emails = db.list_emails()
             sent_today = sum(
-                1 for e in emails
+                1 for e in db.iter_emails()
                 if e.get("sent")
                 and e.get("sent_at", "").startswith(today)
             )
@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import logging
+import re
 from collections.abc import Iterator
 from typing import Any
 
+from pydantic import BaseModel
+
 from app.config import Config
+from app.prompts import CONTEXT_SECTION
+
+try:
+    # C JSON decoder for agent replies; its JSONDecodeError subclasses the
+    # stdlib one, so callers catching json.JSONDecodeError are unaffected.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+log = logging.getLogger(__name__)
 
 
 def _model_name(cfg: Config) -> str:
@@ -43,6 +58,20 @@ def _api_key(cfg: Config) -> str | None:
     return None
 
 
+@functools.cache
+def _completion():
+    """Return ``litellm.completion``, importing LiteLLM on first use only.
+
+    LiteLLM is slow to import, so it stays out of app startup; after the
+    first call this is a plain cached lookup. LiteLLM itself keeps the
+    provider HTTP clients (and their keep-alive pools) in its in-memory
+    client cache, so connections are reused across calls.
+    """
+    from litellm import completion
+
+    return completion
+
+
 # ── Prompt caching (Anthropic) ──────────────────────────────────────────
 
 # Anthropic charges 90% less for cached input tokens (5min ephemeral TTL).
@@ -52,26 +81,55 @@ _CACHE_MIN_CHARS = 4000  # ~1024 tokens at 4 chars/token
 
 
 def _system_message(system: str, provider: str) -> dict:
-    """Build the system message, enabling Anthropic prompt caching when worthwhile."""
-    if provider == "anthropic" and len(system) >= _CACHE_MIN_CHARS:
-        return {
-            "role": "system",
-            "content": [
-                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
-            ],
-        }
+    """Build the system message, enabling Anthropic prompt caching when worthwhile.
+
+    The cache breakpoint goes before the per-turn ``CONTEXT_SECTION`` (if
+    any), so a changed pipeline context doesn't invalidate the static prefix.
+    """
+    static, section, dynamic = system.partition(CONTEXT_SECTION)
+    if provider == "anthropic" and len(static) >= _CACHE_MIN_CHARS:
+        content = [{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}]
+        if section:
+            content.append({"type": "text", "text": section + dynamic})
+        return {"role": "system", "content": content}
     return {"role": "system", "content": system}
 
 
+def _log_cache_usage(resp: Any) -> None:
+    """Log prompt-cache writes/reads reported by the provider (Anthropic).
+
+    OpenAI caches long prefixes automatically and reports hits under
+    ``prompt_tokens_details.cached_tokens``; both end up in the same line.
+    """
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return
+    written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    if not read:
+        details = getattr(usage, "prompt_tokens_details", None)
+        read = getattr(details, "cached_tokens", 0) or 0
+    if written or read:
+        log.debug(
+            "Prompt cache: %d tokens written, %d read (of %s prompt tokens)",
+            written, read, getattr(usage, "prompt_tokens", "?"),
+        )
+
+
 # ── Non-streaming calls ─────────────────────────────────────────────────
 
-def _prepare_json_mode(system: str, messages: list[dict]) -> tuple[str, list[dict]]:
+def _prepare_json_mode(
+    system: str, messages: list[dict], schema: type[BaseModel] | None = None,
+) -> tuple[str, list[dict]]:
     """Inject JSON instructions into both system and the last user message.
 
     OpenAI's Responses API requires the word 'json' in user input,
     not just in the system prompt. This ensures all providers work.
+    A *schema* that the provider can't enforce is spelled out instead.
     """
     system += "\n\nIMPORTANT: Respond ONLY with valid JSON. No markdown fences, no explanation."
+    if schema is not None:
+        system += f"\nThe JSON must match this JSON Schema: {json.dumps(schema.model_json_schema())}"
     messages = [m.copy() for m in messages]
     # Ensure the last user message mentions JSON
     for m in reversed(messages):
@@ -81,11 +139,26 @@ def _prepare_json_mode(system: str, messages: list[dict]) -> tuple[str, list[dic
     return system, messages
 
 
-def chat(cfg: Config, system: str, messages: list[dict], json_mode: bool = False) -> str:
-    from litellm import completion
+def _response_format(schema: type[BaseModel]) -> dict:
+    """Native structured-output request for *schema*.
 
-    if json_mode:
-        system, messages = _prepare_json_mode(system, messages)
+    LiteLLM passes ``json_schema`` through to OpenAI / Gemini and maps it to
+    a forced tool call on Anthropic, returning the tool input as content.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()},
+    }
+
+
+def chat(
+    cfg: Config, system: str, messages: list[dict], json_mode: bool = False,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    # Ollama models get the schema as text; the hosted providers enforce it
+    structured = schema is not None and cfg.llm_provider != "ollama"
+    if (json_mode or schema is not None) and not structured:
+        system, messages = _prepare_json_mode(system, messages, schema)
 
     if cfg.llm_provider == "ollama":
         # Enforce English output for small local models that tend to switch to Chinese
@@ -106,29 +179,54 @@ def chat(cfg: Config, system: str, messages: list[dict], json_mode: bool = False
         # Disable thinking mode for Qwen 3.5 to avoid <think> tags in output
         if "qwen3.5" in (cfg.llm_model or ""):
             kwargs["extra_body"] = {"options": {"num_ctx": 4096}, "think": False}
+    elif structured:
+        kwargs["response_format"] = _response_format(schema)
     elif json_mode:
         kwargs["response_format"] = {"type": "json_object"}
 
-    resp = completion(**kwargs)
+    resp = _completion()(**kwargs)
+    _log_cache_usage(resp)
     return resp.choices[0].message.content or ""
 
 
-def chat_json(cfg: Config, system: str, messages: list[dict]) -> dict | list:
-    raw = chat(cfg, system, messages, json_mode=True).strip()
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[1] if "\n" in raw else raw[3:]
-        if raw.endswith("```"):
-            raw = raw[:-3]
-        raw = raw.strip()
-    return json.loads(raw)
+# Markdown code fence around a JSON reply (closing fence optional — the
+# reply may have been cut off at max_tokens).
+_FENCE_RE = re.compile(r"^```[\w-]*\s*(.*?)\s*(?:```)?$", re.DOTALL)
+
+
+def _parse_json_reply(raw: str) -> dict | list:
+    """Parse an LLM JSON reply, tolerating a markdown fence or stray prose."""
+    m = _FENCE_RE.match(raw)
+    text = m.group(1) if m else raw
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        # Prose around the payload — retry on the outermost {...} / [...]
+        starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+        if not starts:
+            raise
+        start = min(starts)
+        end = text.rfind("}" if text[start] == "{" else "]")
+        if end <= start:
+            raise
+    return _json_loads(text[start:end + 1])
+
+
+def chat_json(
+    cfg: Config, system: str, messages: list[dict], schema: type[BaseModel] | None = None,
+) -> dict | list:
+    """Ask for a JSON reply and parse it.
+
+    With *schema*, the provider's structured output is used so the reply
+    already has the model's shape; callers still normalise missing fields.
+    """
+    return _parse_json_reply(chat(cfg, system, messages, json_mode=True, schema=schema).strip())
 
 
 # ── Streaming calls ─────────────────────────────────────────────────────
 
 def chat_stream(cfg: Config, system: str, messages: list[dict], json_mode: bool = False) -> Iterator[str]:
     """Yield text chunks from the LLM (synchronous generator)."""
-    from litellm import completion
-
     if json_mode:
         system, messages = _prepare_json_mode(system, messages)
 
@@ -154,7 +252,7 @@ def chat_stream(cfg: Config, system: str, messages: list[dict], json_mode: bool
     elif json_mode:
         kwargs["response_format"] = {"type": "json_object"}
 
-    resp = completion(**kwargs)
+    resp = _completion()(**kwargs)
     for chunk in resp:
         if chunk.choices and chunk.choices[0].delta.content:
             yield chunk.choices[0].delta.content
@@ -11,7 +11,7 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.auth import require_recruiter
-from app.database import init_db
+from app.database import init_db, maintain_db
 from app.routes import agent, auth, automations, backup, calendar, candidates, emails, jobs, ollama, profile, search, seeker, settings, transcribe
 from app.scheduler import init_scheduler, shutdown_scheduler
 from app.slack import routes as slack_routes
@@ -42,6 +42,10 @@ async def lifespan(app: FastAPI):
 
     # Graceful shutdown
     shutdown_scheduler()
+    try:
+        maintain_db()
+    except Exception:
+        log.exception("Database maintenance on shutdown failed")
 
 
 app = FastAPI(title="Open Recruiter API", version="0.1.0", lifespan=lifespan)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-import uuid
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -10,6 +13,37 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+def new_id() -> str:
+    """Short random id (8 hex chars), same shape as ``uuid4().hex[:8]``.
+
+    Reads the 4 random bytes directly instead of building a full UUID and
+    slicing its hex form — ~5x cheaper for bulk model creation.
+    """
+    return os.urandom(4).hex()
+
+
+_batch_now: ContextVar[str | None] = ContextVar("batch_now", default=None)
+
+
+def now_iso() -> str:
+    """Current time as ISO string — or the pinned batch time inside :func:`batch_now`."""
+    return _batch_now.get() or datetime.now().isoformat()
+
+
+@contextmanager
+def batch_now() -> Iterator[str]:
+    """Give every model created in this block the same ``created_at`` / ``updated_at``.
+
+    Reads the clock once for a whole bulk build instead of once per field per
+    model. Scoped with a ContextVar, so concurrent requests don't share it.
+    """
+    token = _batch_now.set(datetime.now().isoformat())
+    try:
+        yield _batch_now.get()
+    finally:
+        _batch_now.reset(token)
+
+
 # ── User / Auth ───────────────────────────────────────────────────────────
 
 class UserRole(str, Enum):
@@ -28,11 +62,11 @@ class UserLogin(BaseModel):
     role: UserRole = UserRole.RECRUITER
 
 class User(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     email: str
     name: str = ""
     role: str = "recruiter"
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ── Enums ──────────────────────────────────────────────────────────────────
@@ -69,7 +103,7 @@ class JobCreate(BaseModel):
     contact_email: str = ""
 
 class Job(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     title: str = ""
     company: str = ""
     posted_date: str = ""
@@ -84,7 +118,7 @@ class Job(BaseModel):
     contact_name: str = ""
     contact_email: str = ""
     candidate_count: int = 0
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ── Candidate ──────────────────────────────────────────────────────────────
@@ -133,7 +167,7 @@ class PipelineStatusUpdate(BaseModel):
     pipeline_status: str
 
 class Candidate(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     name: str = ""
     email: str = ""
     phone: str = ""
@@ -154,14 +188,14 @@ class Candidate(BaseModel):
     strengths: list[str] = Field(default_factory=list)
     gaps: list[str] = Field(default_factory=list)
     job_id: str = ""
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
+    updated_at: str = Field(default_factory=now_iso)
 
 
 # ── Job Seeker Profile ────────────────────────────────────────────────────
 
 class JobSeekerProfile(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     user_id: str = ""
     name: str = ""
     email: str = ""
@@ -174,8 +208,8 @@ class JobSeekerProfile(BaseModel):
     resume_summary: str = ""
     resume_path: str = ""
     raw_resume_text: str = ""
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
+    updated_at: str = Field(default_factory=now_iso)
 
 
 class JobSeekerProfileUpdate(BaseModel):
@@ -206,7 +240,7 @@ class EmailComposeRequest(BaseModel):
     candidate_name: str = ""
 
 class Email(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     candidate_id: str = ""
     candidate_name: str = ""
     to_email: str = ""
@@ -221,7 +255,7 @@ class Email(BaseModel):
     message_id: str = ""
     reply_body: str = ""
     replied_at: str | None = None
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ── Agent ──────────────────────────────────────────────────────────────────
@@ -242,18 +276,18 @@ class ChatRequest(BaseModel):
 # ── Activity Log ──────────────────────────────────────────────────────────
 
 class Activity(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     user_id: str = ""
     activity_type: str = ""          # e.g. "email_drafted", "email_sent"
     description: str = ""
     metadata_json: str = ""          # JSON-encoded extra data
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ── Slack Audit Log ────────────────────────────────────────────────────────
 
 class SlackAuditLog(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     slack_user_id: str = ""
     slack_channel: str = ""
     slack_thread_ts: str = ""
@@ -262,7 +296,7 @@ class SlackAuditLog(BaseModel):
     candidate_id: str = ""
     processing_status: str = "pending"  # "pending" | "success" | "error"
     error_message: str = ""
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ── Calendar Event ─────────────────────────────────────────────────────
@@ -275,7 +309,7 @@ class EventType(str, Enum):
     OTHER = "other"
 
 class CalendarEvent(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     title: str = ""
     start_time: str = ""          # ISO datetime
     end_time: str = ""            # ISO datetime
@@ -285,8 +319,8 @@ class CalendarEvent(BaseModel):
     job_id: str = ""
     job_title: str = ""
     notes: str = ""
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
+    updated_at: str = Field(default_factory=now_iso)
 
 class CalendarEventCreate(BaseModel):
     title: str
@@ -377,7 +411,7 @@ class AutomationRuleUpdate(BaseModel):
 
 
 class AutomationRule(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     name: str = ""
     description: str = ""
     rule_type: AutomationRuleType = AutomationRuleType.AUTO_MATCH
@@ -390,16 +424,16 @@ class AutomationRule(BaseModel):
     next_run_at: str | None = None
     run_count: int = 0
     error_count: int = 0
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
+    updated_at: str = Field(default_factory=now_iso)
 
 
 class AutomationLog(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = Field(default_factory=new_id)
     rule_id: str = ""
     rule_name: str = ""
     status: str = "running"
-    started_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    started_at: str = Field(default_factory=now_iso)
     finished_at: str | None = None
     duration_ms: int = 0
     summary: str = ""
@@ -407,4 +441,41 @@ class AutomationLog(BaseModel):
     error_message: str = ""
     items_processed: int = 0
     items_affected: int = 0
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = Field(default_factory=now_iso)
+
+
+# ── LLM Structured Output ─────────────────────────────────────────────────
+# Reply shapes passed to llm.chat_json(schema=...). Field descriptions live in
+# the prompts; these only pin the JSON structure the provider must emit.
+
+class ParsedResume(BaseModel):
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    current_title: str = ""
+    current_company: str = ""
+    skills: list[str] = Field(default_factory=list)
+    experience_years: int | None = None
+    location: str = ""
+    date_of_birth: str = ""
+    resume_summary: str = ""
+
+
+class MatchResult(BaseModel):
+    score: float = 0.0
+    strengths: list[str] = Field(default_factory=list)
+    gaps: list[str] = Field(default_factory=list)
+    reasoning: str = ""
+
+
+class BatchMatchEntry(MatchResult):
+    candidate_id: str = ""
+
+
+class BatchMatchResult(BaseModel):
+    matches: list[BatchMatchEntry] = Field(default_factory=list)
+
+
+class EmailDraft(BaseModel):
+    subject: str = ""
+    body: str = ""
@@ -118,7 +118,7 @@ async def chat_endpoint(req: ChatRequest, current_user: dict = Depends(get_curre
     """
     from app.routes.settings import get_config
     from app.llm import chat_json, chat
-    from app.prompts import CHAT_SYSTEM_WITH_ACTIONS
+    from app.prompts import render_chat_system_with_actions
 
     user_id = current_user["id"]
     cfg = get_config()
@@ -153,14 +153,13 @@ async def chat_endpoint(req: ChatRequest, current_user: dict = Depends(get_curre
     user_role = current_user.get("role", "recruiter")
     log.info("Chat request from user %s with role '%s'", user_id, user_role)
     if user_role == "job_seeker":
-        from app.prompts import CHAT_SYSTEM_JOB_SEEKER, ENCOURAGEMENT_ADDENDUM
+        from app.prompts import render_chat_system_job_seeker, render_chat_system_job_seeker_encouraged
         context = _build_job_seeker_context(user_id, session_id=session_id)
-        system_prompt = CHAT_SYSTEM_JOB_SEEKER.format(context=context)
-        if req.encouragement_mode:
-            system_prompt += ENCOURAGEMENT_ADDENDUM
+        render = render_chat_system_job_seeker_encouraged if req.encouragement_mode else render_chat_system_job_seeker
+        system_prompt = render(context=context)
     else:
         context = _build_chat_context(user_id, current_message=req.message)
-        system_prompt = CHAT_SYSTEM_WITH_ACTIONS.format(context=context)
+        system_prompt = render_chat_system_with_actions(context=context)
 
     # Background: summarize previous session if needed
     _maybe_summarize_previous_session(cfg, user_id, session_id)
@@ -274,7 +273,7 @@ async def chat_endpoint(req: ChatRequest, current_user: dict = Depends(get_curre
             args=(cfg, user_id, req.message, reply_text), daemon=True,
         ).start()
         # Periodic implicit memory extraction (~every 20 messages)
-        msg_count = len(db.list_chat_messages(user_id, limit=100, session_id=session_id))
+        msg_count = db.count_chat_messages(user_id, session_id=session_id)
         if msg_count > 0 and msg_count % 20 == 0:
             threading.Thread(
                 target=_extract_implicit_memories,
@@ -388,7 +387,7 @@ async def chat_stream_endpoint(req: ChatRequest, current_user: dict = Depends(ge
     """
     from app.routes.settings import get_config
     from app.llm import chat_stream, chat_json, chat
-    from app.prompts import CHAT_SYSTEM_WITH_ACTIONS
+    from app.prompts import render_chat_system_with_actions
     from app.models import Email
 
     user_id = current_user["id"]
@@ -424,14 +423,13 @@ async def chat_stream_endpoint(req: ChatRequest, current_user: dict = Depends(ge
 
     # Build prompt
     if user_role == "job_seeker":
-        from app.prompts import CHAT_SYSTEM_JOB_SEEKER, ENCOURAGEMENT_ADDENDUM
+        from app.prompts import render_chat_system_job_seeker, render_chat_system_job_seeker_encouraged
         context = _build_job_seeker_context(user_id, session_id=session_id)
-        system_prompt = CHAT_SYSTEM_JOB_SEEKER.format(context=context)
-        if req.encouragement_mode:
-            system_prompt += ENCOURAGEMENT_ADDENDUM
+        render = render_chat_system_job_seeker_encouraged if req.encouragement_mode else render_chat_system_job_seeker
+        system_prompt = render(context=context)
     else:
         context = _build_chat_context(user_id, current_message=req.message)
-        system_prompt = CHAT_SYSTEM_WITH_ACTIONS.format(context=context)
+        system_prompt = render_chat_system_with_actions(context=context)
 
     # Background: summarize previous session if needed
     _maybe_summarize_previous_session(cfg, user_id, session_id)
@@ -642,7 +640,7 @@ async def chat_stream_endpoint(req: ChatRequest, current_user: dict = Depends(ge
                     target=_extract_and_store_memories,
                     args=(cfg, user_id, req.message, reply_text), daemon=True,
                 ).start()
-                msg_count = len(db.list_chat_messages(user_id, limit=100, session_id=session_id))
+                msg_count = db.count_chat_messages(user_id, session_id=session_id)
                 if msg_count > 0 and msg_count % 20 == 0:
                     threading.Thread(
                         target=_extract_implicit_memories,
@@ -677,10 +675,8 @@ async def get_notifications(current_user: dict = Depends(get_current_user)):
     now = datetime.now()
 
     # Stale candidates: contacted > 3 days ago
-    candidates = db.list_candidates() or []
+    candidates = db.list_candidate_rows(status="contacted")
     for c in candidates:
-        if c.get("status") != "contacted":
-            continue
         updated = c.get("updated_at") or c.get("created_at", "")
         if not updated:
             continue
@@ -750,8 +746,7 @@ async def get_notifications(current_user: dict = Depends(get_current_user)):
             })
 
     # Pending email drafts
-    emails = db.list_emails() or []
-    pending = [e for e in emails if not e["sent"] and not e["approved"]]
+    pending = [e for e in db.iter_emails() if not e["sent"] and not e["approved"]]
     if len(pending) >= 2:
         notifications.append({
             "id": "pending-drafts",
@@ -1523,6 +1518,7 @@ def _process_actions(response: dict, action_data, cfg, user_id: str, session_id:
     elif action_type == "analyze_job_match":
         try:
             from app.llm import chat_json
+            from app.models import MatchResult
             from app.prompts import MATCHING
 
             # Get the job info from recent search results in session history
@@ -1590,7 +1586,9 @@ def _process_actions(response: dict, action_data, cfg, user_id: str, session_id:
                 f"Summary: {profile.get('resume_summary', '')}\n"
             )
 
-            match_data = chat_json(cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}])
+            match_data = chat_json(
+                cfg, system=MATCHING, messages=[{"role": "user", "content": user_msg}], schema=MatchResult,
+            )
             if isinstance(match_data, list):
                 match_data = match_data[0] if match_data else {}
 
@@ -1864,7 +1862,7 @@ def _process_actions(response: dict, action_data, cfg, user_id: str, session_id:
 def _build_smart_suggestions(action_data) -> list[dict]:
     """Build contextual suggestions based on pipeline state and last action."""
     suggestions = []
-    candidates = db.list_candidates() or []
+    candidates = db.list_candidate_rows()
 
     contacted = [c for c in candidates if c.get("status") == "contacted"]
     new_ones = [c for c in candidates if c.get("status") == "new"]
@@ -84,4 +84,7 @@ async def delete_account(
         delete_records: if true, also removes all business data (jobs, candidates, emails, etc.)
     """
     db.delete_user(current_user["id"], delete_records=delete_records)
+    # Settings may have been reset (last user removed) — drop the cached config
+    from app.routes.settings import reload_config
+    reload_config()
     return {"status": "ok"}
@@ -379,7 +379,7 @@ async def unlink_candidate_job(candidate_id: str, job_id: str, _user: dict = Dep
 @router.post("/match")
 async def match_candidates(req: MatchRequest, _user: dict = Depends(get_current_user)):
     """Match selected candidates against a job using vector similarity + LLM."""
-    from app.agents.matching import match_candidate_to_job, rank_candidates_for_job
+    from app.agents.matching import match_candidates_to_job, rank_candidates_for_job
     from app.routes.settings import get_config
 
     job = db.get_job(req.job_id)
@@ -402,7 +402,11 @@ async def match_candidates(req: MatchRequest, _user: dict = Depends(get_current_
         or (cfg.llm_provider == "gemini" and cfg.gemini_api_key)
     )
 
+    llm_matches = match_candidates_to_job(cfg, req.job_id, req.candidate_ids) if has_key else {}
+
     results = []
+    saved: dict[str, dict] = {}
+    now = datetime.now().isoformat()
     for cid in req.candidate_ids:
         c = db.get_candidate(cid)
         if not c:
@@ -410,8 +414,8 @@ async def match_candidates(req: MatchRequest, _user: dict = Depends(get_current_
 
         vscore = vector_scores.get(cid, 0.0)
 
-        if has_key:
-            match_data = match_candidate_to_job(cfg, req.job_id, cid)
+        if cid in llm_matches:
+            match_data = llm_matches[cid]
         else:
             match_data = {
                 "score": vscore,
@@ -420,29 +424,13 @@ async def match_candidates(req: MatchRequest, _user: dict = Depends(get_current_
                 "reasoning": f"Vector similarity: {vscore:.2f} (configure LLM key for detailed evaluation)",
             }
 
-        # Ensure candidate_jobs link exists, then update
-        existing_cj = db.get_candidate_job(cid, req.job_id)
-        now = datetime.now().isoformat()
-        if not existing_cj:
-            db.insert_candidate_job({
-                "id": uuid.uuid4().hex[:8],
-                "candidate_id": cid,
-                "job_id": req.job_id,
-                "match_score": match_data["score"],
-                "match_reasoning": match_data["reasoning"],
-                "strengths": match_data["strengths"],
-                "gaps": match_data["gaps"],
-                "created_at": now,
-                "updated_at": now,
-            })
-        else:
-            db.update_candidate_job(cid, req.job_id, {
-                "match_score": match_data["score"],
-                "match_reasoning": match_data["reasoning"],
-                "strengths": match_data["strengths"],
-                "gaps": match_data["gaps"],
-                "updated_at": now,
-            })
+        saved[cid] = {
+            "match_score": match_data["score"],
+            "match_reasoning": match_data["reasoning"],
+            "strengths": match_data["strengths"],
+            "gaps": match_data["gaps"],
+            "updated_at": now,
+        }
 
         results.append({
             "candidate_id": cid,
@@ -453,6 +441,9 @@ async def match_candidates(req: MatchRequest, _user: dict = Depends(get_current_
             "gaps": match_data["gaps"],
             "reasoning": match_data["reasoning"],
         })
+
+    # Create/update all candidate_jobs links in one transaction
+    db.save_candidate_job_matches(req.job_id, saved)
     return results
 
 
@@ -99,14 +99,12 @@ async def compose_email_with_attachment(
 
 @router.get("/pending")
 async def pending_emails(_user: dict = Depends(get_current_user)):
-    all_emails = db.list_emails()
-    return [e for e in all_emails if not e["sent"] and not e["approved"]]
+    return [e for e in db.iter_emails() if not e["sent"] and not e["approved"]]
 
 
 @router.get("/followups")
 async def followup_emails(_user: dict = Depends(get_current_user)):
-    all_emails = db.list_emails()
-    return [e for e in all_emails if e["sent"] and not e["reply_received"]]
+    return [e for e in db.iter_emails() if e["sent"] and not e["reply_received"]]
 
 
 @router.post("/{email_id}/approve")
@@ -149,6 +147,7 @@ async def send_email(email_id: str, current_user: dict = Depends(get_current_use
         smtp_username=cfg.smtp_username,
         smtp_password=cfg.smtp_password,
         attachment_path=email.get("attachment_path", ""),
+        sendgrid_api_key=cfg.sendgrid_api_key,
     )
 
     if result["status"] != "ok":
@@ -24,17 +24,18 @@ JD_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 @router.get("")
 async def list_jobs_route(_user: dict = Depends(get_current_user)):
     jobs = db.list_jobs()
-    # Enrich with vector-based match counts
+    # Enrich with vector-based match counts (one batched query for all jobs)
+    try:
+        rankings_by_job = vectorstore.search_candidates_for_jobs(
+            [j["id"] for j in jobs], n_results=200,
+        )
+    except Exception:
+        rankings_by_job = {}  # Keep the DB-based counts as fallback
     for j in jobs:
-        try:
-            rankings = vectorstore.search_candidates_for_job(
-                job_id=j["id"], n_results=200,
-            )
+        if j["id"] in rankings_by_job:
             j["candidate_count"] = sum(
-                1 for r in rankings if r["score"] >= MATCH_THRESHOLD
+                1 for r in rankings_by_job[j["id"]] if r["score"] >= MATCH_THRESHOLD
             )
-        except Exception:
-            pass  # Keep the DB-based count as fallback
     return jobs
 
 
@@ -260,9 +261,8 @@ def _auto_match_candidates_for_job(job_id: str) -> None:
     )
     score_map = {r["candidate_id"]: r["score"] for r in rankings}
 
-    for c in candidates:
-        score = score_map.get(c["id"], 0.0)
-        db.update_candidate_job(c["id"], job_id, {
-            "match_score": score,
-            "updated_at": datetime.now().isoformat(),
-        })
+    now = datetime.now().isoformat()
+    db.save_candidate_job_matches(job_id, {
+        c["id"]: {"match_score": score_map.get(c["id"], 0.0), "updated_at": now}
+        for c in candidates
+    })
@@ -144,19 +144,22 @@ def _hybrid_search_jobs(query: str, n_results: int) -> list[dict]:
     scored = scored[:n_results]
 
     # 4) Enrich with full records + vector-based candidate counts
+    try:
+        rankings_by_job = vectorstore.search_candidates_for_jobs(
+            [jid for jid, _ in scored], n_results=200,
+        )
+    except Exception:
+        rankings_by_job = {}
     enriched = []
     for jid, score in scored:
         record = db.get_job(jid)
         if not record:
             continue
         # Enrich candidate_count with vector-based matching (same as list_jobs)
-        try:
-            rankings = vectorstore.search_candidates_for_job(jid, n_results=200)
+        if jid in rankings_by_job:
             record["candidate_count"] = sum(
-                1 for r in rankings if r["score"] >= MATCH_THRESHOLD
+                1 for r in rankings_by_job[jid] if r["score"] >= MATCH_THRESHOLD
             )
-        except Exception:
-            pass
         enriched.append({"record": record, "similarity_score": round(score, 4)})
     return enriched
 
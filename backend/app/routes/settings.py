@@ -1,5 +1,7 @@
 """Settings routes — API key management, config."""
 
+import copy
+
 from fastapi import APIRouter, Depends
 
 from app.auth import get_current_user
@@ -9,6 +11,10 @@ from app.models import Settings
 
 router = APIRouter()
 
+# In-process cache of the merged DB + env config (get_config is called on
+# nearly every request). Invalidated by ``reload_config()``.
+_config_cache: Config | None = None
+
 
 def _build_config() -> Config:
     """Build Config from DB settings, falling back to env vars."""
@@ -44,7 +50,17 @@ def _build_config() -> Config:
 
 def get_config() -> Config:
     """Public helper used by other routes to get the active config."""
-    return _build_config()
+    global _config_cache
+    if _config_cache is None:
+        _config_cache = _build_config()
+    # Callers get their own copy, so a mutation can't leak into the cache
+    return copy.copy(_config_cache)
+
+
+def reload_config() -> None:
+    """Drop the cached config so the next get_config() re-reads settings."""
+    global _config_cache
+    _config_cache = None
 
 
 @router.get("/setup-status")
@@ -109,7 +125,8 @@ async def update_settings(s: Settings, _user: dict = Depends(get_current_user)):
     # Store all non-empty values; convert non-str to str for DB
     to_store = {k: str(v) for k, v in data.items() if v}
     put_settings(to_store)
-    # Invalidate feature flag cache so new values take effect immediately
+    # Invalidate config + feature flag caches so new values take effect immediately
+    reload_config()
     from app.graphs.feature_flags import reload as reload_flags
     reload_flags()
     return {"status": "ok"}
@@ -142,6 +159,7 @@ async def test_email(current_user: dict = Depends(get_current_user)):
         smtp_port=cfg.smtp_port,
         smtp_username=cfg.smtp_username,
         smtp_password=cfg.smtp_password,
+        sendgrid_api_key=cfg.sendgrid_api_key,
     )
     return result
 
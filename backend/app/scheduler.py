@@ -50,6 +50,25 @@ def init_scheduler() -> None:
         _schedule_rule(rule)
     log.info("Loaded %d enabled automation rules.", len(rules))
 
+    # Keep the WAL file and planner stats in check between restarts
+    scheduler.add_job(
+        _run_db_maintenance,
+        trigger=IntervalTrigger(hours=1),
+        id="db_maintenance",
+        name="Database maintenance",
+        replace_existing=True,
+    )
+
+
+def _run_db_maintenance() -> None:
+    try:
+        stats = db.maintain_db()
+        if stats["vacuumed"]:
+            log.info("Vacuumed database (%d free of %d pages).",
+                     stats["freelist_count"], stats["page_count"])
+    except Exception as exc:
+        log.warning("Database maintenance failed: %s", exc)
+
 
 def shutdown_scheduler() -> None:
     """Gracefully shut down the scheduler."""
@@ -1,14 +1,37 @@
-"""Email sending tool — supports console (dev) and SMTP/Gmail."""
+"""Email sending tool — supports console (dev), SMTP/Gmail and SendGrid."""
 
 from __future__ import annotations
 
+import base64
+import functools
+import os
 import smtplib
+import sys
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.utils import make_msgid
 from pathlib import Path
 
+import httpx
+
+SENDGRID_URL = "https://api.sendgrid.com/v3/mail/send"
+
+_RULE = "=" * 60
+_CONSOLE_TEMPLATE = (
+    f"\n{_RULE}\n"
+    "  EMAIL (console mode — not actually sent)\n"
+    "  From: {from_email}\n"
+    "  To:   {to_email}\n"
+    "  Subject: {subject}\n"
+    "  Message-ID: {message_id}\n"
+    "{attachment}"
+    f"{_RULE}\n"
+    "{body}\n"
+    f"{_RULE}\n\n"
+)
+
 
 def send_email(
     *,
@@ -22,25 +45,20 @@ def send_email(
     smtp_username: str = "",
     smtp_password: str = "",
     attachment_path: str = "",
+    sendgrid_api_key: str = "",
 ) -> dict:
     """Send an email using the configured backend.
 
     Returns {"status": "ok"} on success or {"status": "error", "message": ...}.
     """
     if backend == "console":
-        import uuid as _uuid
-        fake_mid = f"<{_uuid.uuid4().hex}@open-recruiter.local>"
-        print(f"\n{'='*60}")
-        print(f"  EMAIL (console mode — not actually sent)")
-        print(f"  From: {from_email}")
-        print(f"  To:   {to_email}")
-        print(f"  Subject: {subject}")
-        print(f"  Message-ID: {fake_mid}")
-        if attachment_path:
-            print(f"  Attachment: {attachment_path}")
-        print(f"{'='*60}")
-        print(body)
-        print(f"{'='*60}\n")
+        fake_mid = f"<{os.urandom(16).hex()}@open-recruiter.local>"
+        attachment = f"  Attachment: {attachment_path}\n" if attachment_path else ""
+        # One write per email instead of a print() per line
+        sys.stdout.write(_CONSOLE_TEMPLATE.format(
+            from_email=from_email, to_email=to_email, subject=subject,
+            message_id=fake_mid, attachment=attachment, body=body,
+        ))
         return {"status": "ok", "message": "Printed to console (dev mode)", "message_id": fake_mid}
 
     if backend in ("smtp", "gmail"):
@@ -91,4 +109,66 @@ def send_email(
         except Exception as e:
             return {"status": "error", "message": f"SMTP error: {e}"}
 
+    if backend == "sendgrid":
+        if not sendgrid_api_key:
+            return {"status": "error", "message": "SendGrid API key not configured"}
+        return _send_sendgrid(
+            api_key=sendgrid_api_key,
+            from_email=from_email,
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            attachment_path=attachment_path,
+        )
+
     return {"status": "error", "message": f"Unknown email backend: {backend}"}
+
+
+@functools.cache
+def _sendgrid_client() -> httpx.Client:
+    """Shared HTTP client, so bulk sends reuse keep-alive TLS connections."""
+    return httpx.Client(
+        timeout=15,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    )
+
+
+def _send_sendgrid(
+    *,
+    api_key: str,
+    from_email: str,
+    to_email: str,
+    subject: str,
+    body: str,
+    attachment_path: str = "",
+) -> dict:
+    """POST one message to the SendGrid v3 mail/send endpoint."""
+    # Set our own Message-ID so replies can be matched like SMTP sends
+    message_id = make_msgid(domain="open-recruiter.local")
+    payload: dict = {
+        "personalizations": [{"to": [{"email": to_email}]}],
+        "from": {"email": from_email},
+        "subject": subject,
+        "content": [{"type": "text/plain", "value": body}],
+        "headers": {"Message-ID": message_id},
+    }
+    if attachment_path:
+        file_path = Path(attachment_path)
+        if file_path.exists():
+            payload["attachments"] = [{
+                "content": base64.b64encode(file_path.read_bytes()).decode(),
+                "filename": file_path.name,
+                "disposition": "attachment",
+            }]
+
+    try:
+        resp = _sendgrid_client().post(
+            SENDGRID_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+    except httpx.HTTPError as e:
+        return {"status": "error", "message": f"SendGrid error: {e}"}
+    if resp.status_code >= 300:
+        return {"status": "error", "message": f"SendGrid error {resp.status_code}: {resp.text[:200]}"}
+    return {"status": "ok", "message": "Email sent via SendGrid", "message_id": message_id}
@@ -10,10 +10,12 @@ from __future__ import annotations
 import logging
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Any
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 
 log = logging.getLogger(__name__)
@@ -25,15 +27,23 @@ if _data_dir:
 else:
     CHROMA_DIR = Path(__file__).resolve().parent.parent / "chroma_data"
 
+# ORT-optimized copy of the embedding model, written on first load.  Kept in
+# the writable data dir — the PyInstaller bundle's models/ may be read-only.
+ONNX_CACHE_DIR = CHROMA_DIR.parent / "onnx_cache"
+
 # Module-level singletons (populated by init_vectorstore)
 _client: chromadb.ClientAPI | None = None
 _embedding_fn: Any = None
+_collections: dict[str, chromadb.Collection] = {}
 
 JOBS_COLLECTION = "jobs"
 CANDIDATES_COLLECTION = "candidates"
 CHAT_SUMMARIES_COLLECTION = "chat_summaries"
 EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
 
+# Max distinct (batch, seq_len) shapes whose zero token_type_ids are kept
+_TTI_CACHE_SIZE = 32
+
 
 # ── ONNX Embedding Function ─────────────────────────────────────────────
 
@@ -61,30 +71,82 @@ class _OnnxEmbeddingFunction:
     """
 
     def __init__(self, model_dir: str) -> None:
-        import numpy as np
+        # Deferred so the sentence-transformers fallback never loads ORT
         import onnxruntime as ort
         from tokenizers import Tokenizer as HFTokenizer
 
-        self._np = np
-
         tok_path = os.path.join(model_dir, "tokenizer.json")
         model_path = os.path.join(model_dir, "model.onnx")
 
         self._tokenizer = HFTokenizer.from_file(tok_path)
-        self._tokenizer.enable_padding()
+        # Pad each batch to its longest row, rounded up to a multiple of 8 —
+        # keeps the set of input shapes small and SIMD-friendly for ORT.
+        self._tokenizer.enable_padding(pad_to_multiple_of=8)
         self._tokenizer.enable_truncation(max_length=512)
 
-        self._session = ort.InferenceSession(
-            model_path,
-            providers=["CPUExecutionProvider"],
-        )
+        self._session = _load_session(ort, model_path)
         self._input_names = {inp.name for inp in self._session.get_inputs()}
+        self._output_name = self._session.get_outputs()[0].name
+        self._dim = self._session.get_outputs()[0].shape[-1]
+        # Per-thread IOBinding + reusable (batch, seq_len, hidden) output
+        # buffer, so ORT doesn't allocate the hidden states on every call.
+        self._io = threading.local()
+        # token_type_ids are all zeros for single-segment input; reuse them
+        # per shape instead of allocating a fresh B×L array every call.
+        self._tti_cache: dict[tuple[int, ...], np.ndarray] = {}
+
+    def _token_type_ids(self, shape: tuple[int, ...]) -> np.ndarray:
+        tti = self._tti_cache.get(shape)
+        if tti is None:
+            if len(self._tti_cache) >= _TTI_CACHE_SIZE:
+                self._tti_cache.clear()
+            tti = np.zeros(shape, dtype=np.int64)
+            self._tti_cache[shape] = tti
+        return tti
 
     def __call__(self, input: list[str]) -> list[list[float]]:
         if not input:
             return []
 
-        np = self._np
+        # Blank strings (e.g. a candidate with no summary/skills/title) carry
+        # no signal — give them a zero vector instead of a model pass.
+        keep = [i for i, text in enumerate(input) if text and text.strip()]
+        if len(keep) == len(input):
+            return self._embed(input)
+
+        output = [[0.0] * self._dim for _ in input]
+        if keep:
+            for i, vec in zip(keep, self._embed([input[i] for i in keep])):
+                output[i] = vec
+        return output
+
+    def _run(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Run the session via IOBinding into this thread's output buffer.
+
+        The returned array is a view that the next call on the same thread
+        overwrites.
+        """
+        batch, seq_len = input_ids.shape
+        size = batch * seq_len * self._dim
+        io = self._io
+        if getattr(io, "capacity", 0) < size:
+            io.buffer = np.empty(size, dtype=np.float32)
+            io.capacity = size
+            io.binding = self._session.io_binding()
+
+        hidden = io.buffer[:size].reshape(batch, seq_len, self._dim)
+        binding = io.binding
+        binding.bind_cpu_input("input_ids", input_ids)
+        binding.bind_cpu_input("attention_mask", attention_mask)
+        if "token_type_ids" in self._input_names:
+            binding.bind_cpu_input("token_type_ids", self._token_type_ids(input_ids.shape))
+        binding.bind_output(
+            self._output_name, "cpu", 0, np.float32, hidden.shape, hidden.ctypes.data,
+        )
+        self._session.run_with_iobinding(binding)
+        return hidden
+
+    def _embed(self, input: list[str]) -> list[list[float]]:
         encoded = self._tokenizer.encode_batch(input)
 
         input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
@@ -92,17 +154,8 @@ class _OnnxEmbeddingFunction:
             [e.attention_mask for e in encoded], dtype=np.int64
         )
 
-        feed: dict[str, Any] = {
-            "input_ids": input_ids,
-            "attention_mask": attention_mask,
-        }
-        if "token_type_ids" in self._input_names:
-            feed["token_type_ids"] = np.zeros_like(input_ids)
-
-        outputs = self._session.run(None, feed)
-
-        # outputs[0] shape: (batch, seq_len, hidden_size)
-        embeddings = outputs[0]
+        # shape: (batch, seq_len, hidden_size)
+        embeddings = self._run(input_ids, attention_mask)
 
         # Mean pooling with attention mask
         mask = attention_mask[:, :, np.newaxis].astype(np.float32)
@@ -115,6 +168,49 @@ class _OnnxEmbeddingFunction:
         return normalized.tolist()
 
 
+def _session_options(ort: Any) -> Any:
+    """SessionOptions shared by both load paths."""
+    so = ort.SessionOptions()
+    # Flush subnormal floats to zero in ORT's worker threads — near-zero
+    # activations otherwise hit slow microcode assists on some x86 CPUs.
+    so.add_session_config_entry("session.set_denormal_as_zero", "1")
+    return so
+
+
+def _load_session(ort: Any, model_path: str) -> Any:
+    """Create the ORT session, reusing a previously serialized optimized graph.
+
+    The first load runs ORT's graph optimizations and saves the result to
+    ``ONNX_CACHE_DIR``; later loads read that file with optimizations off.
+    The file name includes the ORT version and source model size, so an ORT
+    upgrade or a new model produces a fresh copy.
+    """
+    providers = ["CPUExecutionProvider"]
+    optimized = ONNX_CACHE_DIR / (
+        f"{Path(model_path).stem}.ort-{ort.__version__}.{os.path.getsize(model_path)}.onnx"
+    )
+
+    if optimized.is_file():
+        so = _session_options(ort)
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(str(optimized), sess_options=so, providers=providers)
+        except Exception as e:
+            log.warning("Discarding unreadable optimized model %s: %s", optimized, e)
+            optimized.unlink(missing_ok=True)
+
+    # EXTENDED keeps the transformer fusions but not ENABLE_ALL's layout
+    # transforms, whose serialized form is tied to the current CPU.
+    so = _session_options(ort)
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    try:
+        ONNX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        so.optimized_model_filepath = str(optimized)
+    except OSError as e:
+        log.warning("Cannot cache optimized model in %s: %s", ONNX_CACHE_DIR, e)
+    return ort.InferenceSession(model_path, sess_options=so, providers=providers)
+
+
 # ── Initialisation ────────────────────────────────────────────────────────
 
 
@@ -123,7 +219,7 @@ def init_vectorstore() -> None:
 
     Called once during FastAPI lifespan startup.
     """
-    global _client, _embedding_fn
+    global _client, _embedding_fn, _collections
 
     CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -151,28 +247,23 @@ def init_vectorstore() -> None:
         settings=ChromaSettings(anonymized_telemetry=False),
     )
 
-    _client.get_or_create_collection(
-        name=JOBS_COLLECTION,
-        embedding_function=_embedding_fn,
-        metadata={"hnsw:space": "cosine"},
-    )
-    _client.get_or_create_collection(
-        name=CANDIDATES_COLLECTION,
-        embedding_function=_embedding_fn,
-        metadata={"hnsw:space": "cosine"},
-    )
-    _client.get_or_create_collection(
-        name=CHAT_SUMMARIES_COLLECTION,
-        embedding_function=_embedding_fn,
-        metadata={"hnsw:space": "cosine"},
-    )
+    # Keep the handles — get_collection() re-reads collection metadata from
+    # SQLite on every call.
+    _collections = {
+        name: _client.get_or_create_collection(
+            name=name,
+            embedding_function=_embedding_fn,
+            metadata={"hnsw:space": "cosine"},
+        )
+        for name in (JOBS_COLLECTION, CANDIDATES_COLLECTION, CHAT_SUMMARIES_COLLECTION)
+    }
     log.info("ChromaDB initialized at %s", CHROMA_DIR)
 
 
 def _get_collection(name: str) -> chromadb.Collection:
     if _client is None or _embedding_fn is None:
         raise RuntimeError("Vectorstore not initialised — call init_vectorstore() first")
-    return _client.get_collection(name=name, embedding_function=_embedding_fn)
+    return _collections[name]
 
 
 # ── Index / Remove ────────────────────────────────────────────────────────
@@ -201,6 +292,21 @@ def remove_candidate(candidate_id: str) -> None:
 # ── Search ────────────────────────────────────────────────────────────────
 
 
+def _pack(results: dict, id_key: str, query_index: int = 0) -> list[dict]:
+    """Flatten one query's hits from a ``col.query`` result into one dict per hit.
+
+    ``score`` is the raw cosine similarity (``1 - distance``); callers round
+    for display.
+    """
+    ids = results["ids"][query_index]
+    dists = results["distances"][query_index]
+    metas = results["metadatas"][query_index]
+    return [
+        {id_key: rid, "distance": d, "score": 1.0 - d, "metadata": m}
+        for rid, d, m in zip(ids, dists, metas)
+    ]
+
+
 def search_candidates_for_job(
     job_id: str,
     n_results: int = 20,
@@ -225,16 +331,81 @@ def search_candidates_for_job(
         where=where,
         include=["distances", "metadatas"],
     )
+    return _pack(results, "candidate_id")
+
+
+def search_candidates_for_jobs(
+    job_ids: list[str],
+    n_results: int = 20,
+) -> dict[str, list[dict]]:
+    """Bulk :func:`search_candidates_for_job` for many jobs at once.
 
-    output = []
-    for i, cid in enumerate(results["ids"][0]):
-        dist = results["distances"][0][i]
-        output.append({
-            "candidate_id": cid,
-            "distance": dist,
-            "score": round(1.0 - dist, 4),
-            "metadata": results["metadatas"][0][i],
-        })
+    Queries with the job embeddings already stored in ChromaDB (no JD text
+    is re-embedded) and runs every lookup in a single ``query`` call.
+    Returns ``{job_id: hits}``; jobs missing from the vector store map to
+    an empty list.
+    """
+    output: dict[str, list[dict]] = {jid: [] for jid in job_ids}
+    if not output:
+        return output
+
+    jobs_col = _get_collection(JOBS_COLLECTION)
+    candidates_col = _get_collection(CANDIDATES_COLLECTION)
+
+    job_result = jobs_col.get(ids=list(output), include=["embeddings"])
+    if not job_result["ids"]:
+        return output
+
+    results = candidates_col.query(
+        query_embeddings=job_result["embeddings"],
+        n_results=n_results,
+        include=["distances", "metadatas"],
+    )
+    for i, jid in enumerate(job_result["ids"]):
+        output[jid] = _pack(results, "candidate_id", i)
+    return output
+
+
+def shortlist_candidates_for_jobs(
+    job_ids: list[str],
+    candidate_ids: list[str],
+    k: int = 20,
+) -> dict[str, list[str]]:
+    """Top-*k* of *candidate_ids* per job by cosine similarity, best first.
+
+    Scores every candidate against every job with one matrix product over
+    the stored embeddings, so callers can send only the shortlist to the
+    LLM. Candidates without an embedding can't be ranked and are always
+    appended; jobs without one get every candidate.
+    """
+    output: dict[str, list[str]] = {jid: list(candidate_ids) for jid in job_ids}
+    if not output or not candidate_ids:
+        return output
+
+    job_result = _get_collection(JOBS_COLLECTION).get(ids=list(output), include=["embeddings"])
+    cand_result = _get_collection(CANDIDATES_COLLECTION).get(
+        ids=list(candidate_ids), include=["embeddings"],
+    )
+    if not job_result["ids"] or not cand_result["ids"]:
+        return output
+
+    def _unit(vectors) -> np.ndarray:
+        m = np.asarray(vectors, dtype=np.float32)
+        return m / np.maximum(np.linalg.norm(m, axis=1, keepdims=True), 1e-12)
+
+    # (jobs × candidates) cosine similarities in a single GEMM
+    scores = _unit(job_result["embeddings"]) @ _unit(cand_result["embeddings"]).T
+    ranked_ids = np.asarray(cand_result["ids"])
+    indexed = set(cand_result["ids"])
+    unranked = [cid for cid in candidate_ids if cid not in indexed]
+    # Top-k per job for all jobs at once: partition, then sort only the k
+    # survivors of each row
+    top = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1, kind="stable")
+    idx = np.take_along_axis(idx, order, axis=1)
+    for jid, row in zip(job_result["ids"], ranked_ids[idx].tolist()):
+        output[jid] = row + unranked
     return output
 
 
@@ -265,16 +436,7 @@ def search_jobs_for_candidate(
         include=["distances", "metadatas"],
     )
 
-    output = []
-    for i, jid in enumerate(results["ids"][0]):
-        dist = results["distances"][0][i]
-        output.append({
-            "job_id": jid,
-            "distance": dist,
-            "score": round(1.0 - dist, 4),
-            "metadata": results["metadatas"][0][i],
-        })
-    return output
+    return _pack(results, "job_id")
 
 
 def search_similar_candidates(
@@ -295,17 +457,7 @@ def search_similar_candidates(
         include=["distances", "metadatas"],
     )
 
-    output = []
-    for i, cid in enumerate(results["ids"][0]):
-        if cid == candidate_id:
-            continue
-        dist = results["distances"][0][i]
-        output.append({
-            "candidate_id": cid,
-            "distance": dist,
-            "score": round(1.0 - dist, 4),
-            "metadata": results["metadatas"][0][i],
-        })
+    output = [r for r in _pack(results, "candidate_id") if r["candidate_id"] != candidate_id]
     return output[:n_results]
 
 
@@ -328,16 +480,7 @@ def search_by_text(
     results = col.query(**kwargs)
 
     id_key = "candidate_id" if collection_name == CANDIDATES_COLLECTION else "job_id"
-    output = []
-    for i, rid in enumerate(results["ids"][0]):
-        dist = results["distances"][0][i]
-        output.append({
-            id_key: rid,
-            "distance": dist,
-            "score": round(1.0 - dist, 4),
-            "metadata": results["metadatas"][0][i],
-        })
-    return output
+    return _pack(results, id_key)
 
 
 # ── Stats / Reindex ───────────────────────────────────────────────────────
@@ -353,7 +496,7 @@ def reindex_all_jobs(jobs: list[dict]) -> int:
     count = 0
     for j in jobs:
         text = j.get("raw_text", "")
-        if not text:
+        if not text.strip():
             continue
         col.upsert(
             ids=[j["id"]],
@@ -427,24 +570,18 @@ def search_session_summaries(
 ) -> list[dict]:
     """Find past session summaries semantically relevant to a query."""
     col = _get_collection(CHAT_SUMMARIES_COLLECTION)
-    if col.count() == 0:
+    total = col.count()
+    if total == 0:
         return []
     results = col.query(
         query_texts=[query_text],
-        n_results=min(n_results, col.count()),
+        n_results=min(n_results, total),
         where={"user_id": user_id},
         include=["distances", "metadatas", "documents"],
     )
-    output = []
-    for i, sid in enumerate(results["ids"][0]):
-        dist = results["distances"][0][i]
-        output.append({
-            "id": sid,
-            "distance": dist,
-            "score": round(1.0 - dist, 4),
-            "metadata": results["metadatas"][0][i],
-            "document": results["documents"][0][i],
-        })
+    output = _pack(results, "id")
+    for row, doc in zip(output, results["documents"][0]):
+        row["document"] = doc
     return output
 
 
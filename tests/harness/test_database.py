@@ -0,0 +1,250 @@
+"""Database harness — bulk write helpers against an isolated SQLite file.
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_database.py -v
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def _module_db(tmp_path_factory):
+    """Point app.database at one tmp SQLite file for the module and run init_db() once."""
+    from app import database as db
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(db, "DB_PATH", tmp_path_factory.mktemp("db") / "test.db")
+        db.init_db()
+        yield db
+
+
+@pytest.fixture
+def isolated_db(_module_db):
+    """Empty every table before the test instead of rebuilding the schema."""
+    db = _module_db
+    conn = db.get_conn()
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )]
+    with conn:
+        for table in tables:
+            conn.execute(f"DELETE FROM {table}")
+    conn.close()
+    yield db
+
+
+def _candidate(cid: str) -> dict:
+    now = datetime.now().isoformat()
+    return {"id": cid, "name": f"Candidate {cid}", "created_at": now, "updated_at": now}
+
+
+class TestCandidateJobMatches:
+
+    def test_creates_missing_links_and_updates_existing(self, isolated_db):
+        db = isolated_db
+        for cid in ("c1", "c2"):
+            db.insert_candidate(_candidate(cid))
+        db.insert_candidate_job({"candidate_id": "c1", "job_id": "j1", "pipeline_status": "contacted"})
+
+        db.save_candidate_job_matches("j1", {
+            "c1": {"match_score": 0.9, "strengths": ["Python"], "gaps": []},
+            "c2": {"match_score": 0.4, "match_reasoning": "weak", "gaps": ["Go"]},
+        })
+
+        c1 = db.get_candidate_job("c1", "j1")
+        assert c1["match_score"] == 0.9
+        assert c1["strengths"] == ["Python"]
+        assert c1["pipeline_status"] == "contacted"  # untouched column kept
+        c2 = db.get_candidate_job("c2", "j1")
+        assert c2["match_score"] == 0.4
+        assert c2["match_reasoning"] == "weak"
+        assert c2["gaps"] == ["Go"]
+        assert len(db.list_candidate_jobs(job_id="j1")) == 2
+
+    def test_empty_is_noop(self, isolated_db):
+        isolated_db.save_candidate_job_matches("j1", {})
+        assert isolated_db.list_candidate_jobs(job_id="j1") == []
+
+
+class TestCandidateRows:
+
+    def test_hot_columns_only_with_status_filter(self, isolated_db):
+        db = isolated_db
+        db.insert_candidate({**_candidate("c1"), "status": "contacted", "resume_summary": "long text"})
+        db.insert_candidate(_candidate("c2"))
+
+        rows = db.list_candidate_rows(status="contacted")
+        assert [r["id"] for r in rows] == ["c1"]
+        assert set(rows[0]) == {"id", "name", "email", "status", "created_at", "updated_at"}
+        assert {r["id"] for r in db.list_candidate_rows()} == {"c1", "c2"}
+
+    def test_iterators_stream_same_rows_as_lists(self, isolated_db):
+        db = isolated_db
+        for cid in ("c1", "c2"):
+            db.insert_candidate(_candidate(cid))
+        now = datetime.now().isoformat()
+        db.insert_emails([{"id": f"e{i}", "candidate_id": "c1", "created_at": now} for i in range(2)])
+
+        rows = db.iter_candidate_rows()
+        assert not isinstance(rows, list)
+        assert list(rows) == db.list_candidate_rows()
+        assert list(db.iter_emails(candidate_id="c1")) == db.list_emails(candidate_id="c1")
+        assert next(db.iter_emails())["sent"] is False
+
+
+class TestUpserts:
+
+    def test_put_settings_overwrites_and_keeps_other_keys(self, isolated_db):
+        db = isolated_db
+        db.put_settings({"llm_provider": "openai", "llm_model": "gpt-4o"})
+        db.put_settings({"llm_model": "gpt-4o-mini"})
+        assert db.get_settings() == {"llm_provider": "openai", "llm_model": "gpt-4o-mini"}
+
+    def test_session_summary_replaced_per_session(self, isolated_db):
+        db = isolated_db
+        base = {"session_id": "s1", "user_id": "u1", "created_at": datetime.now().isoformat()}
+        db.insert_session_summary({**base, "id": "a1", "summary": "first"})
+        db.insert_session_summary({**base, "id": "a2", "summary": "second", "topics": ["hiring"]})
+        summary = db.get_session_summary("s1")
+        assert summary["id"] == "a2"
+        assert summary["summary"] == "second"
+        assert len(db.list_session_summaries("u1")) == 1
+
+
+class TestJsonColumns:
+
+    def test_skills_round_trip_as_compact_json_text(self, isolated_db):
+        db = isolated_db
+        skills = ["Python", "Go", "Résumé parsing"]
+        db.insert_candidate({**_candidate("c1"), "skills": skills})
+        assert db.get_candidate("c1")["skills"] == skills
+
+        conn = db.get_conn()
+        stored = conn.execute("SELECT skills FROM candidates WHERE id = 'c1'").fetchone()[0]
+        conn.close()
+        assert stored == '["Python","Go","Résumé parsing"]'
+
+
+class TestJobTextCompression:
+
+    def _job(self, raw_text: str) -> dict:
+        return {
+            "id": "j1", "title": "Backend", "company": "Acme",
+            "raw_text": raw_text, "created_at": datetime.now().isoformat(),
+        }
+
+    def test_long_raw_text_round_trips_compressed(self, isolated_db):
+        db = isolated_db
+        text = "Senior Python engineer — 5+ years, Postgres, AWS. " * 100
+        db.insert_job(self._job(text))
+        assert db.get_job("j1")["raw_text"] == text
+        assert db.list_jobs()[0]["raw_text"] == text
+
+        conn = db.get_conn()
+        stored = conn.execute("SELECT raw_text FROM jobs WHERE id = 'j1'").fetchone()[0]
+        conn.close()
+        assert isinstance(stored, bytes) and len(stored) < len(text)
+
+        db.update_job("j1", {"raw_text": text + " Remote OK."})
+        assert db.get_job("j1")["raw_text"] == text + " Remote OK."
+
+    def test_short_and_legacy_plain_text_unchanged(self, isolated_db):
+        db = isolated_db
+        db.insert_job(self._job("Short JD"))
+        assert db.get_job("j1")["raw_text"] == "Short JD"
+
+
+class TestEmailsBulk:
+
+    def test_insert_emails_single_transaction(self, isolated_db):
+        db = isolated_db
+        now = datetime.now().isoformat()
+        db.insert_emails([
+            {"id": f"e{i}", "candidate_id": "c1", "subject": f"s{i}", "created_at": now}
+            for i in range(3)
+        ])
+        emails = db.list_emails(candidate_id="c1")
+        assert sorted(e["id"] for e in emails) == ["e0", "e1", "e2"]
+        assert all(e["sent"] is False and e["email_type"] == "outreach" for e in emails)
+
+    def test_insert_emails_rolls_back_on_error(self, isolated_db):
+        db = isolated_db
+        now = datetime.now().isoformat()
+        with pytest.raises(Exception):
+            db.insert_emails([
+                {"id": "e1", "created_at": now},
+                {"id": "e1", "created_at": now},  # duplicate primary key
+            ])
+        assert db.list_emails() == []
+
+
+class TestListJoins:
+
+    def test_list_candidates_attaches_job_matches(self, isolated_db):
+        db = isolated_db
+        now = datetime.now().isoformat()
+        for cid in ("c1", "c2"):
+            db.insert_candidate(_candidate(cid))
+        for jid in ("j1", "j2"):
+            db.insert_job({"id": jid, "title": jid.upper(), "company": "Acme", "created_at": now})
+        db.save_candidate_job_matches("j1", {"c1": {"match_score": 0.4}, "c2": {"match_score": 0.7}})
+        db.save_candidate_job_matches("j2", {"c1": {"match_score": 0.9}})
+
+        by_id = {c["id"]: c for c in db.list_candidates()}
+        assert [m["job_id"] for m in by_id["c1"]["job_matches"]] == ["j2", "j1"]
+        assert by_id["c1"]["match_score"] == 0.9
+        assert by_id["c1"]["job_matches"][0]["job_title"] == "J2"
+        assert [m["job_id"] for m in by_id["c2"]["job_matches"]] == ["j1"]
+
+        counts = {j["id"]: j["candidate_count"] for j in db.list_jobs()}
+        assert counts == {"j1": 2, "j2": 1}
+
+
+class TestChatMessages:
+
+    def test_count_is_not_capped_by_list_window(self, isolated_db):
+        db = isolated_db
+        now = datetime.now().isoformat()
+        for i in range(120):
+            db.insert_chat_message({
+                "id": f"m{i}", "user_id": "u1", "session_id": "s1" if i < 110 else "s2",
+                "role": "user", "content": f"#{i}", "created_at": now,
+            })
+        assert db.count_chat_messages("u1", session_id="s1") == 110
+        assert db.count_chat_messages("u1") == 120
+        assert len(db.list_chat_messages("u1", limit=100, session_id="s1")) == 100
+
+
+class TestMaintenance:
+
+    def test_vacuums_bloated_file_and_truncates_wal(self, isolated_db):
+        db = isolated_db
+        now = datetime.now().isoformat()
+        db.insert_emails([
+            {"id": f"e{i}", "body": "x" * 4000, "created_at": now} for i in range(200)
+        ])
+        conn = db.get_conn()
+        with conn:
+            conn.execute("DELETE FROM emails")
+        conn.close()
+
+        stats = db.maintain_db()
+        assert stats["vacuumed"] is True
+        wal = db.DB_PATH.with_name(db.DB_PATH.name + "-wal")
+        assert not wal.exists() or wal.stat().st_size == 0
+        assert db.maintain_db()["vacuumed"] is False
+
+    def test_prunes_expired_llm_cache_rows(self, isolated_db):
+        db = isolated_db
+        db.put_jd_parse("fresh", {"title": "x"})
+        db.put_match_results({"m1": {"score": 0.5}})
+        conn = db.get_conn()
+        with conn:
+            conn.execute("UPDATE match_cache SET created_at = '2000-01-01T00:00:00'")
+        conn.close()
+
+        assert db.maintain_db()["cache_rows_pruned"] == 1
+        assert db.get_match_results(["m1"]) == {}
+        assert db.get_jd_parse("fresh") == {"title": "x"}
@@ -0,0 +1,62 @@
+"""Email sender harness — SendGrid backend against a mocked HTTP transport.
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_email_sender.py -v
+"""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+
+from app.tools import email_sender
+
+
+def _mock_client(monkeypatch, status: int, requests: list[httpx.Request]) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status, text="" if status < 300 else "bad key")
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(email_sender, "_sendgrid_client", lambda: client)
+
+
+class TestSendGrid:
+
+    def _send(self, **overrides) -> dict:
+        kwargs = dict(
+            backend="sendgrid", from_email="me@acme.com", to_email="jane@example.com",
+            subject="Hi", body="Hello Jane", sendgrid_api_key="SG.key",
+        )
+        return email_sender.send_email(**{**kwargs, **overrides})
+
+    def test_posts_v3_payload_with_message_id(self, monkeypatch):
+        requests: list[httpx.Request] = []
+        _mock_client(monkeypatch, 202, requests)
+
+        result = self._send()
+        assert result["status"] == "ok"
+        req = requests[0]
+        assert str(req.url) == email_sender.SENDGRID_URL
+        assert req.headers["Authorization"] == "Bearer SG.key"
+        payload = json.loads(req.content)
+        assert payload["personalizations"] == [{"to": [{"email": "jane@example.com"}]}]
+        assert payload["headers"]["Message-ID"] == result["message_id"]
+
+    def test_errors_reported_not_raised(self, monkeypatch):
+        _mock_client(monkeypatch, 401, [])
+        assert "401" in self._send()["message"]
+        assert self._send(sendgrid_api_key="")["status"] == "error"
+
+
+class TestConsole:
+
+    def test_prints_block_in_one_write(self, capsys):
+        result = email_sender.send_email(
+            backend="console", from_email="me@acme.com", to_email="jane@example.com",
+            subject="Hi", body="Hello Jane",
+        )
+        out = capsys.readouterr().out
+        assert result["status"] == "ok"
+        assert f"  Message-ID: {result['message_id']}\n" in out
+        assert "Subject: Hi\n" in out and "Hello Jane\n" in out
+        assert "Attachment" not in out
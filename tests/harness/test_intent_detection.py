@@ -163,3 +163,54 @@ class TestIntentDisambiguation:
             "I need a senior React engineer with 5 years experience"
         )
         assert result is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 4. Supervisor fast path — plain chat without the LLM classifier
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSupervisorChatFastPath:
+    """classify_intent short-circuits obvious chat before calling the LLM."""
+
+    @pytest.mark.parametrize("msg", [
+        "hi",
+        "Thanks!",
+        "谢谢",
+        "What's the pipeline status?",
+        "how many candidates do we have",
+        "查看候选人",
+        "list jobs",
+    ])
+    def test_plain_chat_skips_llm(self, msg: str, monkeypatch):
+        from app.graphs import supervisor
+
+        def no_llm(*args, **kwargs):
+            raise AssertionError("LLM classifier should not be called")
+
+        monkeypatch.setattr(supervisor, "chat_json", no_llm)
+        result = supervisor.classify_intent({"cfg": None, "user_message": msg})
+        assert result["plan_status"] == "chat"
+
+    @pytest.mark.parametrize("msg", [
+        "find candidates for the backend job then email them",
+        "Draft outreach to Alice",
+        "What is a good salary for a backend engineer?",
+        "Which jobs match my profile?",
+        "Show me remote python jobs",
+        "List candidates for the backend role and draft outreach emails to the top 3",
+        "Who are the best candidates for job j1? Draft emails to them",
+        "Show candidates, then email them",
+    ])
+    def test_ambiguous_goes_to_llm(self, msg: str, monkeypatch):
+        from app.graphs import supervisor
+
+        calls = []
+
+        def fake_chat_json(cfg, system, messages):
+            calls.append(messages[-1]["content"])
+            return {"intent": "plan"}
+
+        monkeypatch.setattr(supervisor, "chat_json", fake_chat_json)
+        result = supervisor.classify_intent({"cfg": None, "user_message": msg})
+        assert calls == [msg]
+        assert result["plan_status"] == "needs_plan"
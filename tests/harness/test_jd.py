@@ -0,0 +1,56 @@
+"""JD agent harness — content-hash cache around the LLM parse (mocked LLM).
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_jd.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.config import Config
+
+
+CFG = Config(llm_provider="openai", llm_model="gpt-4o")
+JD_TEXT = "Senior Backend Engineer at Acme. 5+ years Python, Postgres. Remote."
+
+
+@pytest.fixture
+def jd(tmp_path, monkeypatch):
+    """Point app.database at a tmp SQLite file and count LLM calls."""
+    from app import database as db
+    from app.agents import jd as jd_agent
+
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "test.db")
+    db.init_db()
+    calls = []
+
+    def fake_chat_json(cfg, system, messages):
+        calls.append(messages[-1]["content"])
+        return {"title": "Backend Engineer", "company": "Acme", "experience_years": "5", "remote": True}
+
+    monkeypatch.setattr(jd_agent, "chat_json", fake_chat_json)
+    yield jd_agent, calls
+
+
+class TestParseCache:
+
+    def test_repeat_submission_skips_llm(self, jd):
+        jd, calls = jd
+        first = jd.parse_jd_text(CFG, JD_TEXT)
+        second = jd.parse_jd_text(CFG, JD_TEXT)
+        assert first == second
+        assert first["experience_years"] == 5 and first["remote"] is True
+        assert len(calls) == 1
+
+    def test_different_text_is_parsed_again(self, jd):
+        jd, calls = jd
+        jd.parse_jd_text(CFG, JD_TEXT)
+        jd.parse_jd_text(CFG, JD_TEXT + " Visa sponsorship available.")
+        assert len(calls) == 2
+
+    def test_switching_model_is_parsed_again(self, jd):
+        jd, calls = jd
+        jd.parse_jd_text(CFG, JD_TEXT)
+        jd.parse_jd_text(Config(llm_provider="openai", llm_model="gpt-4o-mini"), JD_TEXT)
+        jd.parse_jd_text(Config(llm_provider="anthropic", llm_model="gpt-4o"), JD_TEXT)
+        assert len(calls) == 3
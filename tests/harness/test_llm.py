@@ -0,0 +1,156 @@
+"""LLM harness — JSON reply parsing and request building (no network).
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_llm.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm
+from app.config import Config
+from app.llm import _parse_json_reply
+
+
+class TestParseJsonReply:
+
+    @pytest.mark.parametrize("raw", [
+        '{"score": 0.8}',
+        '```json\n{"score": 0.8}\n```',
+        '```\n{"score": 0.8}\n```',
+        '```json {"score": 0.8} ```',
+        '```json\n{"score": 0.8}',  # truncated, no closing fence
+        'Here is the result:\n{"score": 0.8}\nHope this helps!',
+    ])
+    def test_object_variants(self, raw: str):
+        assert _parse_json_reply(raw) == {"score": 0.8}
+
+    def test_list_reply_with_prose(self):
+        assert _parse_json_reply('Matches: [{"id": "c1"}, {"id": "c2"}] done') == [
+            {"id": "c1"}, {"id": "c2"},
+        ]
+
+    def test_fenced_content_keeps_inner_backticks(self):
+        raw = '```json\n{"body": "use `pip install`"}\n```'
+        assert _parse_json_reply(raw) == {"body": "use `pip install`"}
+
+    @pytest.mark.parametrize("raw", ["", "no json here", "{ broken"])
+    def test_unparseable_raises(self, raw: str):
+        with pytest.raises(json.JSONDecodeError):
+            _parse_json_reply(raw)
+
+
+class TestPromptCaching:
+
+    def _fake_completion(self, monkeypatch, calls, usage):
+        def completion(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+                usage=usage,
+            )
+        monkeypatch.setattr(llm, "_completion", lambda: completion)
+
+    def test_long_anthropic_system_is_cacheable_and_usage_logged(self, monkeypatch, caplog):
+        calls = []
+        usage = SimpleNamespace(prompt_tokens=2000, cache_creation_input_tokens=0, cache_read_input_tokens=1800)
+        self._fake_completion(monkeypatch, calls, usage)
+        cfg = Config(llm_provider="anthropic", llm_model="claude-sonnet-4-20250514")
+
+        with caplog.at_level(logging.DEBUG, logger="app.llm"):
+            assert llm.chat(cfg, "x" * llm._CACHE_MIN_CHARS, [{"role": "user", "content": "hi"}]) == "ok"
+
+        system = calls[0]["messages"][0]
+        assert system["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "0 tokens written, 1800 read" in caplog.text
+
+    def test_other_providers_get_plain_system_string(self, monkeypatch):
+        calls = []
+        self._fake_completion(monkeypatch, calls, None)
+        cfg = Config(llm_provider="openai", llm_model="gpt-4o")
+        llm.chat(cfg, "x" * llm._CACHE_MIN_CHARS, [{"role": "user", "content": "hi"}])
+        assert calls[0]["messages"][0]["content"] == "x" * llm._CACHE_MIN_CHARS
+
+    def test_context_section_kept_out_of_cached_block(self, monkeypatch):
+        from app.prompts import CHAT_SYSTEM_WITH_ACTIONS
+
+        calls = []
+        self._fake_completion(monkeypatch, calls, None)
+        cfg = Config(llm_provider="anthropic", llm_model="claude-sonnet-4-20250514")
+        for context in ("## Candidates\n- Alice", "## Candidates\n- Bob"):
+            llm.chat(cfg, CHAT_SYSTEM_WITH_ACTIONS.format(context=context), [{"role": "user", "content": "hi"}])
+
+        first, second = (c["messages"][0]["content"] for c in calls)
+        assert first[0] == second[0]  # identical cached prefix
+        assert "cache_control" not in first[1]
+        assert first[1]["text"].rstrip().endswith("- Alice") and "{context}" not in first[0]["text"]
+
+    def test_encouragement_addendum_in_cached_prefix(self):
+        from app.prompts import CHAT_SYSTEM_JOB_SEEKER_ENCOURAGED, ENCOURAGEMENT_ADDENDUM
+
+        msg = llm._system_message(CHAT_SYSTEM_JOB_SEEKER_ENCOURAGED.format(context="- Profile"), "anthropic")
+        cached, dynamic = msg["content"]
+        assert cached["text"].endswith(ENCOURAGEMENT_ADDENDUM)
+        assert dynamic["text"].rstrip().endswith("- Profile")
+
+
+class TestStructuredOutput:
+
+    def _capture(self, monkeypatch, reply: str) -> list[dict]:
+        calls = []
+
+        def completion(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=None)
+        monkeypatch.setattr(llm, "_completion", lambda: completion)
+        return calls
+
+    def test_schema_sent_as_response_format_without_json_suffix(self, monkeypatch):
+        from app.models import MatchResult
+
+        calls = self._capture(monkeypatch, '{"score": 0.7, "strengths": [], "gaps": [], "reasoning": "ok"}')
+        cfg = Config(llm_provider="anthropic", llm_model="claude-sonnet-4-20250514")
+        data = llm.chat_json(cfg, "Match.", [{"role": "user", "content": "hi"}], schema=MatchResult)
+
+        assert data["score"] == 0.7
+        fmt = calls[0]["response_format"]
+        assert fmt["type"] == "json_schema"
+        assert fmt["json_schema"]["name"] == "MatchResult"
+        assert set(fmt["json_schema"]["schema"]["properties"]) == {"score", "strengths", "gaps", "reasoning"}
+        assert calls[0]["messages"][0]["content"] == "Match."
+        assert calls[0]["messages"][1]["content"] == "hi"
+
+    def test_ollama_gets_schema_in_prompt(self, monkeypatch):
+        from app.models import EmailDraft
+
+        calls = self._capture(monkeypatch, '{"subject": "s", "body": "b"}')
+        cfg = Config(llm_provider="ollama", llm_model="llama3")
+        llm.chat_json(cfg, "Draft.", [{"role": "user", "content": "hi"}], schema=EmailDraft)
+
+        assert "response_format" not in calls[0]
+        assert '"subject"' in calls[0]["messages"][0]["content"]
+
+
+class TestCompiledPrompts:
+
+    def test_renderers_match_str_format(self):
+        from app import prompts
+
+        context = "## Candidates\n- Alice {not a field}"
+        for template, render in [
+            (prompts.CHAT_SYSTEM_WITH_ACTIONS, prompts.render_chat_system_with_actions),
+            (prompts.CHAT_SYSTEM_JOB_SEEKER, prompts.render_chat_system_job_seeker),
+            (prompts.CHAT_SYSTEM_JOB_SEEKER_ENCOURAGED, prompts.render_chat_system_job_seeker_encouraged),
+        ]:
+            assert render(context=context) == template.format(context=context)
+
+    def test_escapes_and_unsupported_fields(self):
+        from app.prompts import compile_prompt
+
+        assert compile_prompt('{{"a": {x}}} {y}{x}')(x=1, y="b") == '{"a": 1} b1'
+        with pytest.raises(ValueError):
+            compile_prompt("{score:.2f}")
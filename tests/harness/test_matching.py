@@ -0,0 +1,161 @@
+"""Matching harness — batched LLM candidate scoring (mocked LLM + DB).
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_matching.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from app.config import Config
+
+CFG = Config(llm_provider="openai", llm_model="gpt-4o")
+JOB = {"id": "j1", "title": "Backend Engineer", "raw_text": "Python, Postgres, 5+ years"}
+CANDIDATES = {
+    f"c{i}": {"id": f"c{i}", "name": f"Candidate {i}", "skills": ["Python"], "experience_years": i}
+    for i in range(1, 13)
+}
+
+
+@pytest.fixture
+def matching(tmp_path, monkeypatch):
+    """Patch DB lookups so the matcher sees the in-memory JOB / CANDIDATES.
+
+    The match cache lives in a tmp SQLite file, empty for every test.
+    """
+    from app.agents import matching as m
+
+    monkeypatch.setattr(m.db, "DB_PATH", tmp_path / "test.db")
+    m.db.init_db()
+    monkeypatch.setattr(m.db, "get_job", lambda jid: JOB if jid == JOB["id"] else None)
+    monkeypatch.setattr(m.db, "get_candidate", lambda cid: CANDIDATES.get(cid))
+    yield m
+
+
+def _batch_reply(user_msg: str) -> dict:
+    ids = [line.split(": ", 1)[1] for line in user_msg.splitlines() if line.startswith("### Candidate ID: ")]
+    return {"matches": [
+        {"candidate_id": cid, "score": 0.8, "strengths": ["Python"], "gaps": [], "reasoning": "ok"}
+        for cid in ids
+    ]}
+
+
+def _single_reply() -> dict:
+    return {"score": 0.5, "strengths": [], "gaps": [], "reasoning": "single"}
+
+
+class TestBatchedMatching:
+
+    def test_one_call_per_batch(self, matching, monkeypatch):
+        calls = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            calls.append(system)
+            return _batch_reply(messages[-1]["content"])
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        ids = [f"c{i}" for i in range(1, 13)]
+        results = matching.match_candidates_to_job(CFG, "j1", ids)
+
+        assert list(results) == ids
+        assert all(r["score"] == 0.8 for r in results.values())
+        # 12 candidates → one batch of 10 + one of 2, no per-candidate calls
+        assert calls == [matching.MATCHING_BATCH, matching.MATCHING_BATCH]
+
+    def test_unparseable_reply_falls_back_per_candidate(self, matching, monkeypatch):
+        calls = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            calls.append(system)
+            if system == matching.MATCHING_BATCH:
+                raise json.JSONDecodeError("bad", "", 0)
+            return _single_reply()
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        results = matching.match_candidates_to_job(CFG, "j1", ["c1", "c2", "c3"])
+
+        assert [r["reasoning"] for r in results.values()] == ["single"] * 3
+        assert calls.count(matching.MATCHING) == 3
+
+    def test_omitted_candidate_scored_individually(self, matching, monkeypatch):
+        calls = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            calls.append(system)
+            if system == matching.MATCHING_BATCH:
+                reply = _batch_reply(messages[-1]["content"])
+                reply["matches"] = [m for m in reply["matches"] if m["candidate_id"] != "c2"]
+                return reply
+            return _single_reply()
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        results = matching.match_candidates_to_job(CFG, "j1", ["c1", "c2", "c3"])
+
+        assert results["c1"]["score"] == 0.8
+        assert results["c2"]["reasoning"] == "single"
+        assert calls.count(matching.MATCHING) == 1
+
+    def test_fallback_calls_run_concurrently(self, matching, monkeypatch):
+        # Every fallback call blocks until all three are in flight at once
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            if system == matching.MATCHING_BATCH:
+                raise json.JSONDecodeError("bad", "", 0)
+            barrier.wait()
+            return _single_reply()
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        results = matching.match_candidates_to_job(CFG, "j1", ["c1", "c2", "c3"])
+        assert list(results) == ["c1", "c2", "c3"]
+        # A broken barrier would surface as an "LLM error" result instead
+        assert [r["reasoning"] for r in results.values()] == ["single"] * 3
+
+    def test_unknown_ids_skipped(self, matching, monkeypatch):
+        monkeypatch.setattr(matching, "chat_json", lambda cfg, system, messages, schema=None: _single_reply())
+        assert list(matching.match_candidates_to_job(CFG, "j1", ["c1", "ghost"])) == ["c1"]
+        assert matching.match_candidates_to_job(CFG, "missing-job", ["c1"]) == {}
+
+
+class TestMatchCache:
+
+    def test_repeat_run_only_scores_new_or_changed_candidates(self, matching, monkeypatch):
+        calls = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            calls.append(messages[-1]["content"].count("### Candidate ID: "))
+            return _batch_reply(messages[-1]["content"])
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        first = matching.match_candidates_to_job(CFG, "j1", ["c1", "c2", "c3"])
+        monkeypatch.setitem(CANDIDATES, "c2", {**CANDIDATES["c2"], "skills": ["Python", "Go"]})
+        second = matching.match_candidates_to_job(CFG, "j1", ["c1", "c2", "c3", "c4"])
+
+        assert second["c1"] == first["c1"]
+        assert list(second) == ["c1", "c2", "c3", "c4"]
+        assert calls == [3, 2]  # edited c2 + new c4 only
+
+    def test_model_switch_rescores(self, matching, monkeypatch):
+        calls = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            calls.append(cfg.llm_model)
+            return _single_reply()
+
+        monkeypatch.setattr(matching, "chat_json", fake_chat_json)
+        matching.match_candidate_to_job(CFG, "j1", "c1")
+        matching.match_candidate_to_job(CFG, "j1", "c1")
+        matching.match_candidate_to_job(Config(llm_provider="openai", llm_model="gpt-4o-mini"), "j1", "c1")
+        assert calls == ["gpt-4o", "gpt-4o-mini"]
+
+    def test_llm_errors_not_cached(self, matching, monkeypatch):
+        def failing(cfg, system, messages, schema=None):
+            raise RuntimeError("rate limited")
+
+        monkeypatch.setattr(matching, "chat_json", failing)
+        assert matching.match_candidate_to_job(CFG, "j1", "c1")["reasoning"].startswith("LLM error")
+        monkeypatch.setattr(matching, "chat_json", lambda cfg, system, messages, schema=None: _single_reply())
+        assert matching.match_candidate_to_job(CFG, "j1", "c1")["reasoning"] == "single"
@@ -0,0 +1,25 @@
+"""Models harness — id / timestamp default factories.
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_models.py -v
+"""
+
+from __future__ import annotations
+
+import re
+
+from app.models import Candidate, Email, batch_now, new_id
+
+
+class TestDefaults:
+
+    def test_new_id_shape(self):
+        ids = {new_id() for _ in range(1000)}
+        assert all(re.fullmatch(r"[0-9a-f]{8}", i) for i in ids)
+        assert len(ids) == 1000
+
+    def test_batch_now_pins_timestamps_inside_block_only(self):
+        with batch_now() as now:
+            models = [Candidate(name=f"c{i}") for i in range(3)] + [Email()]
+        assert {m.created_at for m in models} == {now}
+        assert all(c.updated_at == now for c in models[:3])
+        assert Candidate(name="later").created_at >= now
@@ -0,0 +1,63 @@
+"""Resume agent harness — text compaction and regex contact fallback (mocked LLM).
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_resume.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.agents import resume
+
+RESUME = (
+    "Jane   Doe\n\n\n\n"
+    "Born 1990-01-02 · Experience 2015 - 2020\n"
+    "jane.doe+jobs@mail.example.co.uk    +1 (415) 555-0134\n\n\n"
+    "Skills:  Python,\tGo"
+)
+
+
+class TestParseResume:
+
+    def test_compacts_text_and_falls_back_to_regex_contacts(self, monkeypatch):
+        sent = []
+
+        def fake_chat_json(cfg, system, messages, schema=None):
+            sent.append(messages[-1]["content"])
+            return {"name": "Jane Doe", "email": "", "skills": ["Python", "Go"]}
+
+        monkeypatch.setattr(resume, "chat_json", fake_chat_json)
+        parsed = resume.parse_resume_text(None, RESUME)
+
+        assert "   " not in sent[0] and "\n\n\n" not in sent[0] and "\t" not in sent[0]
+        assert parsed["email"] == "jane.doe+jobs@mail.example.co.uk"
+        assert parsed["phone"] == "+1 (415) 555-0134"
+
+    def test_llm_contacts_take_precedence(self, monkeypatch):
+        monkeypatch.setattr(
+            resume, "chat_json",
+            lambda cfg, system, messages, schema=None: {"email": "jane@work.com", "phone": "555 0100 200"},
+        )
+        parsed = resume.parse_resume_text(None, RESUME)
+        assert (parsed["email"], parsed["phone"]) == ("jane@work.com", "555 0100 200")
+        assert resume._find_phone("Experience 2015 - 2020, born 1990-01-02") == ""
+
+
+class TestFindPhone:
+
+    @pytest.mark.parametrize("line", [
+        "GPA 3.8 2014-2018",
+        "Python 3.10 2019 - 2023",
+        "2016-2018 2018-2021",
+        "Zip 94105 2019",
+    ])
+    def test_years_and_decimals_are_not_phones(self, line: str):
+        assert resume._find_phone(line) == ""
+
+    @pytest.mark.parametrize("line, phone", [
+        ("call (415) 555-0134 today", "(415) 555-0134"),
+        ("Phone: 415 555 2019", "415 555 2019"),
+        ("Mobile: 138 0013 8000", "138 0013 8000"),
+    ])
+    def test_phone_shapes(self, line: str, phone: str):
+        assert resume._find_phone(line) == phone
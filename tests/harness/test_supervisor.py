@@ -0,0 +1,189 @@
+"""Supervisor harness — plan step grouping and agent dispatch (mocked agents).
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_supervisor.py -v
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.graphs import supervisor
+
+
+def _steps(*deps: list[int]) -> list[dict]:
+    return [
+        {"step": i + 1, "agent": f"a{i + 1}", "depends_on": d}
+        for i, d in enumerate(deps)
+    ]
+
+
+def _agents(batch: list[dict]) -> list[str]:
+    return [s["agent"] for s in batch]
+
+
+class TestGroupSteps:
+
+    def test_legacy_mode_grouping_unchanged(self):
+        steps = [
+            {"agent": "a1", "mode": "sequential"},
+            {"agent": "a2", "mode": "parallel"},
+            {"agent": "a3", "mode": "parallel"},
+            {"agent": "a4", "mode": "sequential"},
+        ]
+        assert [_agents(b) for b in supervisor._group_steps(steps)] == [["a1"], ["a2", "a3"], ["a4"]]
+
+    def test_depends_on_phases(self):
+        # 1 → {2, 3} → 4 ; 5 is independent
+        steps = _steps([], [1], [1], [2, 3], [])
+        assert [_agents(b) for b in supervisor._group_steps(steps)] == [
+            ["a1", "a5"], ["a2", "a3"], ["a4"],
+        ]
+
+    def test_cycle_falls_back_to_plan_order(self):
+        steps = _steps([], [3], [2])
+        assert [_agents(b) for b in supervisor._group_steps(steps)] == [["a1"], ["a2"], ["a3"]]
+
+
+class TestValidatePlan:
+
+    def test_valid_plan_returns_phases(self):
+        steps = _steps([], [1], [1], [2, 3])
+        assert [_agents(b) for b in supervisor.validate_plan(steps)] == [["a1"], ["a2", "a3"], ["a4"]]
+
+    @pytest.mark.parametrize("deps, message", [
+        (([], [3], [2]), "cycle"),
+        (([], [7]), "unknown step 7"),
+        (([1],), "itself"),
+    ])
+    def test_invalid_plan_raises(self, deps, message):
+        with pytest.raises(ValueError, match=message):
+            supervisor.validate_plan(_steps(*deps))
+
+    def test_string_step_numbers_are_converted(self):
+        steps = [{"step": 1, "agent": "a1", "depends_on": []},
+                 {"step": "2", "agent": "a2", "depends_on": ["1"]}]
+        assert [_agents(b) for b in supervisor.validate_plan(steps)] == [["a1"], ["a2"]]
+
+    @pytest.mark.parametrize("steps", [
+        [{"step": 1, "depends_on": [[1]]}],
+        [{"step": 1, "depends_on": []}, {"step": 2, "depends_on": [{"step": 1}]}],
+        [{"step": "first", "depends_on": []}],
+    ])
+    def test_unconvertible_references_are_validation_errors(self, steps):
+        with pytest.raises(ValueError, match="invalid"):
+            supervisor.validate_plan(steps)
+
+    def test_generate_plan_rejects_cyclic_plan(self, monkeypatch):
+        from app.config import Config
+
+        plan = {"steps": _steps([], [3], [2])}
+        monkeypatch.setattr(supervisor, "chat_json", lambda cfg, system, messages: plan)
+        monkeypatch.setattr(supervisor, "_plan_cache", supervisor.OrderedDict())
+        result = supervisor.generate_plan({"cfg": Config(), "user_message": "do things"})
+        assert result["plan_status"] == "error"
+        assert not supervisor._plan_cache
+
+
+class TestDispatch:
+
+    def test_independent_steps_run_concurrently(self, monkeypatch):
+        barrier = threading.Barrier(2, timeout=5)
+        lock = threading.Lock()
+        in_flight = peak = 0
+        seen: list[dict] = []
+
+        class _Agent:
+            def __init__(self, name):
+                self.name = name
+
+            def invoke(self, agent_input):
+                nonlocal in_flight, peak
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                try:
+                    if self.name in ("a2", "a3"):
+                        barrier.wait()  # both must be in flight at once
+                    seen.append(agent_input["agent_input"]["previous_results"].copy())
+                    return {"agent_output": {"agent": self.name}}
+                finally:
+                    with lock:
+                        in_flight -= 1
+
+        monkeypatch.setattr(
+            supervisor, "_get_agent_graphs", lambda: {f"a{i}": _Agent(f"a{i}") for i in range(1, 5)},
+        )
+        state = {"cfg": None, "plan": {"steps": _steps([], [1], [1], [2, 3])}}
+        results = supervisor.dispatch_agents(state)["agent_results"]
+
+        assert set(results) == {"a1", "a2", "a3", "a4"}
+        # _invoke_agent turns a broken barrier into {"error": ...} — none allowed
+        assert not [name for name, out in results.items() if "error" in out]
+        assert peak == 2
+        assert set(seen[-1]) == {"a1", "a2", "a3"}  # a4 saw both phase-2 results
+
+    def test_same_agent_steps_in_one_phase_keep_both_results(self, monkeypatch):
+        class _Agent:
+            def invoke(self, agent_input):
+                return {"agent_output": {"step": agent_input["agent_input"]["step"]}}
+
+        monkeypatch.setattr(supervisor, "_get_agent_graphs", lambda: {"communication": _Agent()})
+        steps = [
+            {"step": 1, "agent": "communication", "depends_on": []},
+            {"step": 2, "agent": "communication", "depends_on": []},
+        ]
+        results = supervisor.dispatch_agents({"cfg": None, "plan": {"steps": steps}})["agent_results"]
+
+        assert results == {
+            "communication#1": {"step": 1},
+            "communication#2": {"step": 2},
+        }
+
+
+class TestPlanCache:
+
+    def test_repeat_request_reuses_plan_without_llm(self, monkeypatch):
+        from app.config import Config
+
+        calls = []
+
+        def fake_chat_json(cfg, system, messages):
+            calls.append(messages[-1]["content"])
+            return {"goal": "g", "steps": [{"step": 1, "agent": "jd", "depends_on": []}]}
+
+        monkeypatch.setattr(supervisor, "chat_json", fake_chat_json)
+        monkeypatch.setattr(supervisor, "_plan_cache", supervisor.OrderedDict())
+        cfg = Config(llm_provider="openai", llm_model="gpt-4o")
+
+        first = supervisor.generate_plan({"cfg": cfg, "user_message": "Parse the JD, then match Alice."})
+        first["plan"]["steps"].append({"step": 2})  # callers may mutate their copy
+        second = supervisor.generate_plan({"cfg": cfg, "user_message": "parse the JD,  then match ALICE."})
+        supervisor.generate_plan({"cfg": cfg, "user_message": "Parse the JD, then match Bob."})
+
+        assert len(second["plan"]["steps"]) == 1
+        assert calls == ["Parse the JD, then match Alice.", "Parse the JD, then match Bob."]
+
+    def test_operators_and_digits_keep_requests_apart(self):
+        from app.config import Config
+
+        cfg = Config(llm_provider="openai", llm_model="gpt-4o")
+        key = supervisor._plan_key
+        assert key(cfg, "Email candidates for job j1 with score > 0.8") != key(
+            cfg, "Email candidates for job j1 with score < 0.8")
+        assert key(cfg, "Shortlist 3/4 candidates") != key(cfg, "Shortlist 3-4 candidates")
+        assert key(cfg, "Parse  the JD") == key(cfg, "parse the jd")
+
+    @pytest.mark.parametrize("decision", ["cancel", "modify"])
+    def test_rejected_plan_is_evicted(self, decision, monkeypatch):
+        from app.config import Config
+
+        cfg = Config(llm_provider="openai", llm_model="gpt-4o")
+        plan = {"steps": [{"step": 1, "agent": "jd"}]}
+        monkeypatch.setattr(supervisor, "_plan_cache", supervisor.OrderedDict())
+        supervisor._remember_plan(supervisor._plan_key(cfg, "do things"), plan)
+        monkeypatch.setattr(supervisor, "interrupt", lambda payload: {"decision": decision})
+
+        supervisor.present_plan({"cfg": cfg, "user_message": "do things", "plan": plan})
+        assert not supervisor._plan_cache
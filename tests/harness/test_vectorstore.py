@@ -0,0 +1,128 @@
+"""Vectorstore harness — ChromaDB search helpers against a throwaway collection.
+
+Uses a tiny bag-of-words hash embedder instead of the BGE model, so no
+model files or network are needed.
+
+Run:  cd backend && uv run python -m pytest ../tests/harness/test_vectorstore.py -v
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import chromadb
+import pytest
+from chromadb.api.types import EmbeddingFunction
+from chromadb.config import Settings as ChromaSettings
+
+
+class _HashEmbedding(EmbeddingFunction):
+    """Deterministic 16-dim bag-of-words embedding, L2-normalised."""
+
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "test-hash"
+
+    def get_config(self) -> dict:
+        return {}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "_HashEmbedding":
+        return _HashEmbedding()
+
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        out = []
+        for text in input:
+            vec = [0.0] * 16
+            for word in text.lower().split():
+                vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 16] += 1.0
+            norm = sum(x * x for x in vec) ** 0.5 or 1.0
+            out.append([x / norm for x in vec])
+        return out
+
+
+@pytest.fixture
+def vs(tmp_path, monkeypatch):
+    """Point app.vectorstore at a fresh PersistentClient in tmp_path."""
+    from app import vectorstore
+
+    embedding_fn = _HashEmbedding()
+    client = chromadb.PersistentClient(
+        path=str(tmp_path / "chroma"),
+        settings=ChromaSettings(anonymized_telemetry=False),
+    )
+    collections = {
+        name: client.get_or_create_collection(
+            name=name, embedding_function=embedding_fn, metadata={"hnsw:space": "cosine"},
+        )
+        for name in (
+            vectorstore.JOBS_COLLECTION,
+            vectorstore.CANDIDATES_COLLECTION,
+            vectorstore.CHAT_SUMMARIES_COLLECTION,
+        )
+    }
+    monkeypatch.setattr(vectorstore, "_client", client)
+    monkeypatch.setattr(vectorstore, "_embedding_fn", embedding_fn)
+    monkeypatch.setattr(vectorstore, "_collections", collections)
+
+    vectorstore.index_job("j1", "python backend engineer postgres", {"title": "Backend"})
+    vectorstore.index_candidate("c1", "python backend engineer", {"name": "Alice"})
+    vectorstore.index_candidate("c2", "enterprise sales manager", {"name": "Bob"})
+    vectorstore.index_candidate("c3", "python data engineer", {"name": "Cara"})
+    yield vectorstore
+
+
+class TestSearchPacking:
+
+    def test_candidates_for_job_shape_and_order(self, vs):
+        results = vs.search_candidates_for_job("j1", n_results=3)
+        assert [r["candidate_id"] for r in results][0] == "c1"
+        first = results[0]
+        assert set(first) == {"candidate_id", "distance", "score", "metadata"}
+        assert first["metadata"] == {"name": "Alice"}
+        assert first["score"] == 1.0 - first["distance"]
+
+    def test_unknown_job_returns_empty(self, vs):
+        assert vs.search_candidates_for_job("nope") == []
+
+    def test_bulk_search_matches_single_job_search(self, vs):
+        vs.index_job("j2", "enterprise sales lead", {"title": "Sales"})
+        bulk = vs.search_candidates_for_jobs(["j1", "j2", "missing"], n_results=200)
+        assert list(bulk) == ["j1", "j2", "missing"]
+        assert bulk["missing"] == []
+        for jid in ("j1", "j2"):
+            single = vs.search_candidates_for_job(jid, n_results=200)
+            assert [r["candidate_id"] for r in bulk[jid]] == [r["candidate_id"] for r in single]
+            assert [r["score"] for r in bulk[jid]] == pytest.approx([r["score"] for r in single])
+        assert bulk["j2"][0]["candidate_id"] == "c2"
+
+    def test_bulk_search_empty_input(self, vs):
+        assert vs.search_candidates_for_jobs([]) == {}
+
+    def test_shortlist_matches_search_order_and_keeps_unindexed(self, vs):
+        vs.index_job("j2", "enterprise sales lead", {"title": "Sales"})
+        shortlist = vs.shortlist_candidates_for_jobs(["j1", "j2", "missing"], ["c1", "c2", "c3", "new"], k=1)
+        assert shortlist["j1"] == ["c1", "new"]
+        assert shortlist["j2"] == ["c2", "new"]
+        assert shortlist["missing"] == ["c1", "c2", "c3", "new"]
+        assert vs.shortlist_candidates_for_jobs(["j1"], []) == {"j1": []}
+
+    def test_similar_candidates_excludes_self(self, vs):
+        results = vs.search_similar_candidates("c1", n_results=2)
+        ids = [r["candidate_id"] for r in results]
+        assert "c1" not in ids
+        assert len(ids) == 2
+
+    def test_search_by_text_id_key(self, vs):
+        assert "job_id" in vs.search_by_text(vs.JOBS_COLLECTION, "python", n_results=1)[0]
+        assert "candidate_id" in vs.search_by_text(vs.CANDIDATES_COLLECTION, "python", n_results=1)[0]
+
+    def test_session_summaries_include_document(self, vs):
+        assert vs.search_session_summaries("python", user_id="u1") == []
+        vs.index_session_summary("s1", "hired a python engineer", {"user_id": "u1"})
+        results = vs.search_session_summaries("python", user_id="u1")
+        assert results[0]["id"] == "s1"
+        assert results[0]["document"] == "hired a python engineer"